@@ -3,17 +3,23 @@ AI-powered code analysis using Google Gemini API.
 """
 
 import os
+import re
+import ast
 import json
-import time
-from pathlib import Path
+import asyncio
+import hashlib
+import heapq
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 from .config import (
     CODE_REVIEW_SCHEMA, CODE_SUMMARY_SCHEMA, BOLD, RESET, GREY, GREEN, RED, YELLOW, BLUE,
-    get_configured_source_dirs, get_configured_llm_review_file_count
+    get_configured_source_dirs, get_configured_llm_review_file_count,
+    get_configured_llm_max_concurrency, get_configured_llm_batch_size,
+    get_configured_llm_local_review_max_lines
 )
-from .utils import load_cache, save_cache, get_file_md5, is_binary_file, count_lines
-from .dependency_analysis import find_all_source_dirs
+from .utils import load_cache, save_cache, read_file_with_md5, analyze_file, make_ignore_matcher, scandir_walk, has_binary_extension
 
 # Optional dependencies
 try:
@@ -22,12 +28,80 @@ try:
 except ImportError:
     HAS_GENAI = False
 
+# =============================================================================
+# RESPONSE SCHEMA VALIDATION
+# =============================================================================
+
+def _build_validator(schema):
+    """Compile a JSON-schema validator, or return None if jsonschema is not installed."""
+    try:
+        import jsonschema
+    except ImportError:
+        return None
+    validator_cls = jsonschema.validators.validator_for(schema)
+    return validator_cls(schema)
+
+@functools.lru_cache(maxsize=1)
+def code_review_validator():
+    """Validator for CODE_REVIEW_SCHEMA, compiled on first use."""
+    return _build_validator(CODE_REVIEW_SCHEMA)
+
+@functools.lru_cache(maxsize=1)
+def code_summary_validator():
+    """Validator for CODE_SUMMARY_SCHEMA, compiled on first use."""
+    return _build_validator(CODE_SUMMARY_SCHEMA)
+
+# Opening ```json fence some models wrap their JSON in despite being asked not to
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*', re.IGNORECASE)
+_JSON_DECODER = json.JSONDecoder()
+
+def parse_llm_json(result):
+    """
+    Parse the JSON value at the start of an AI response.
+
+    Plain JSON responses are decoded directly. Only if that fails is a markdown
+    code fence stripped and decoding retried. Raises json.JSONDecodeError if
+    the response holds no JSON.
+    """
+    text = result.lstrip()
+    try:
+        return _JSON_DECODER.raw_decode(text)[0]
+    except json.JSONDecodeError:
+        fence = _JSON_FENCE_RE.match(text)
+        if fence is None:
+            raise
+        return _JSON_DECODER.raw_decode(text[fence.end():])[0]
+
+def _llm_error(response_text):
+    """Return the message of an AI response that reports an error, or None otherwise."""
+    try:
+        parsed = parse_llm_json(response_text)
+    except json.JSONDecodeError:
+        return None
+    if isinstance(parsed, dict) and "error" in parsed:
+        return str(parsed["error"])
+    return None
+
+def get_schema_validator(schema):
+    """Return the cached validator for one of the AI response schemas, if available."""
+    if schema is CODE_REVIEW_SCHEMA:
+        return code_review_validator()
+    if schema is CODE_SUMMARY_SCHEMA:
+        return code_summary_validator()
+    return None
+
 # =============================================================================
 # AI-POWERED ANALYSIS
 # =============================================================================
 
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+
+# Model handle shared by every request; rebuilt after the client is (re)configured
+_gemini_model = None
+
 def configure_gemini():
     """Configure the Gemini client with API key."""
+    global _gemini_model
     if not HAS_GENAI:
         print(f"{RED}✖ Error: google-generativeai package not installed. Install with 'pip install google-generativeai'.{RESET}")
         return None
@@ -39,84 +113,379 @@ def configure_gemini():
         return None
     try:
         genai.configure(api_key=api_key)
+        _gemini_model = None
         return True
     except Exception as e:
         print(f"{RED}✖ Error configuring Gemini client: {e}{RESET}")
         return None
 
-def call_llm(prompt_messages, json_schema=None):
-    """Call the Google Gemini API with optional JSON schema enforcement."""
+def _get_gemini_model():
+    """Return the shared Gemini model, creating it on first use."""
+    global _gemini_model
+    if _gemini_model is None:
+        _gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _gemini_model
+
+def _build_gemini_request(prompt_messages, json_schema=None):
+    """Convert OpenAI-style messages into a Gemini prompt and generation config."""
+    system_prompt = ""
+    user_prompt = ""
+    for msg in prompt_messages:
+        if msg['role'] == 'system':
+            system_prompt += msg['content'] + "\n"
+        elif msg['role'] == 'user':
+            user_prompt += msg['content'] + "\n"
+    
+    full_prompt = system_prompt + user_prompt
+    
+    generation_config = {
+        "temperature": 0.2,
+        "top_p": 0.8,
+        "top_k": 20,
+    }
+    
+    if json_schema:
+        full_prompt += f"\n\nPlease respond with valid JSON matching this schema: {json.dumps(json_schema)}"
+    
+    return full_prompt, generation_config
+
+def _llm_cache_key(full_prompt, generation_config):
+    """Cache key for an exact prompt and generation config."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(full_prompt.encode("utf-8"))
+    digest.update(json.dumps(generation_config, sort_keys=True).encode("utf-8"))
+    return f"llm|{digest.hexdigest()}"
+
+def _cache_llm_response(cache_key, response_text):
+    """Store an AI response in the analysis cache unless it reports an error."""
+    if _llm_error(response_text) is not None:
+        return
+    cache = load_cache()
+    cache[cache_key] = response_text
+    save_cache(cache)
+
+def _add_streamed_chunk(parts, chunk_text, json_schema, on_chunk):
+    """
+    Record one streamed response chunk. Returns True once a JSON response is
+    complete, so the caller can stop reading the stream.
+    """
+    parts.append(chunk_text)
+    if on_chunk is not None:
+        on_chunk(chunk_text)
+    if not json_schema or '}' not in chunk_text:
+        return False
+    try:
+        parse_llm_json("".join(parts))
+        return True
+    except json.JSONDecodeError:
+        return False
+
+def call_llm(prompt_messages, json_schema=None, on_chunk=None):
+    """
+    Call the Google Gemini API with optional JSON schema enforcement.
+
+    The response is streamed: on_chunk, if given, receives each piece of text as
+    it arrives, and a JSON response stops being read once it is complete.
+    """
     if not HAS_GENAI:
         return '{"error": "Google Generative AI not available"}'
         
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # Convert OpenAI-style messages to Gemini format
-        system_prompt = ""
-        user_prompt = ""
-        for msg in prompt_messages:
-            if msg['role'] == 'system':
-                system_prompt += msg['content'] + "\n"
-            elif msg['role'] == 'user':
-                user_prompt += msg['content'] + "\n"
-        
-        full_prompt = system_prompt + user_prompt
+        full_prompt, generation_config = _build_gemini_request(prompt_messages, json_schema)
+        cache_key = _llm_cache_key(full_prompt, generation_config)
+        cached_response = load_cache().get(cache_key)
+        if cached_response:
+            if on_chunk is not None:
+                on_chunk(cached_response)
+            return cached_response
         
-        generation_config = {
-            "temperature": 0.2,
-            "top_p": 0.8,
-            "top_k": 20,
-        }
+        model = _get_gemini_model()
+        parts = []
+        for chunk in model.generate_content(full_prompt, generation_config=generation_config, stream=True):
+            if _add_streamed_chunk(parts, chunk.text, json_schema, on_chunk):
+                break
+        response_text = "".join(parts)
+        _cache_llm_response(cache_key, response_text)
+        return response_text
         
-        if json_schema:
-            full_prompt += f"\n\nPlease respond with valid JSON matching this schema: {json.dumps(json_schema)}"
+    except Exception as e:
+        return f'{{"error": "Error calling Google Gemini API: {str(e)}"}}'
+
+async def acall_llm(prompt_messages, json_schema=None):
+    """
+    Asynchronous variant of call_llm, so several requests can be in flight at once.
+
+    Responses are not cached by prompt here: its caller, run_llm_analysis_on_top_files,
+    caches each file's result under that file's own key.
+    """
+    if not HAS_GENAI:
+        return '{"error": "Google Generative AI not available"}'
         
-        response = model.generate_content(full_prompt, generation_config=generation_config)
-        return response.text
+    try:
+        full_prompt, generation_config = _build_gemini_request(prompt_messages, json_schema)
+        model = _get_gemini_model()
+        parts = []
+        response = await model.generate_content_async(full_prompt, generation_config=generation_config, stream=True)
+        async for chunk in response:
+            if _add_streamed_chunk(parts, chunk.text, json_schema, None):
+                break
+        return "".join(parts)
         
     except Exception as e:
         return f'{{"error": "Error calling Google Gemini API: {str(e)}"}}'
 
+async def _call_llm_concurrently(requests, max_concurrency):
+    """
+    Send (messages, schema) requests concurrently, with at most max_concurrency in
+    flight to stay within the API's rate limits. Results keep the order of requests.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call_one(messages, schema):
+        async with semaphore:
+            return await acall_llm(messages, schema)
+
+    return await asyncio.gather(*(call_one(messages, schema) for messages, schema in requests))
+
+def _run_llm_requests(requests, max_concurrency):
+    """
+    Send requests through _call_llm_concurrently from synchronous code.
+
+    asyncio.run() refuses to start while an event loop is already running in this
+    thread (Jupyter, async callers), so in that case the requests are run on a
+    worker thread with its own loop. They are still sent concurrently either way.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_call_llm_concurrently(requests, max_concurrency))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: asyncio.run(_call_llm_concurrently(requests, max_concurrency))).result()
+
+def _batch_schema(schema):
+    """Wrap a per-file response schema so one response carries a result for each file."""
+    item_schema = dict(schema) if schema else {"type": "object", "properties": {}}
+    item_schema["properties"] = {"file": {"type": "string"}, **item_schema.get("properties", {})}
+    item_schema["required"] = ["file"] + list(item_schema.get("required", []))
+    return {
+        "type": "object",
+        "properties": {"results": {"type": "array", "items": item_schema}},
+        "required": ["results"]
+    }
+
+# Markdown code-fence language tags for the script extensions
+FENCE_LANGUAGES = {
+    '.py': 'python', '.js': 'javascript', '.jsx': 'jsx', '.ts': 'typescript', '.tsx': 'tsx',
+    '.sh': 'bash', '.bat': 'batch', '.ps1': 'powershell', '.rb': 'ruby', '.php': 'php',
+    '.pl': 'perl', '.go': 'go', '.rs': 'rust', '.java': 'java', '.c': 'c', '.cpp': 'cpp',
+    '.h': 'c', '.cs': 'csharp', '.m': 'objectivec', '.swift': 'swift', '.kt': 'kotlin',
+    '.dart': 'dart'
+}
+
+def _build_batch_messages(system_prompt, project_context, files):
+    """Build one prompt covering several (relative_path, content) files."""
+    sections = []
+    for idx, (relative_path, file_content) in enumerate(files, 1):
+        ext = os.path.splitext(relative_path)[1].lower()
+        language = FENCE_LANGUAGES.get(ext) or ext.lstrip(".") or "text"
+        sections.append(f"### File {idx}: {relative_path}\n```{language}\n{file_content}\n```")
+    user_prompt = (
+        f"Context: {project_context}\n\n"
+        f"Analyze each of the following {len(files)} files separately. Return one entry in "
+        f"\"results\" per file, with \"file\" set to the path shown in its heading.\n\n"
+        + "\n\n".join(sections)
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def _split_batch_result(result, relative_paths):
+    """
+    Split a batched AI response into one JSON string per file, in the order of
+    relative_paths. Files the response does not cover map to None.
+    """
+    try:
+        parsed = parse_llm_json(result)
+    except json.JSONDecodeError:
+        return [None] * len(relative_paths)
+    items = parsed.get("results") if isinstance(parsed, dict) else None
+    if not isinstance(items, list):
+        return [None] * len(relative_paths)
+
+    by_file = {item.get("file"): item for item in items if isinstance(item, dict)}
+    split = []
+    for idx, relative_path in enumerate(relative_paths):
+        item = by_file.get(relative_path)
+        if item is None and len(items) == len(relative_paths) and isinstance(items[idx], dict):
+            item = items[idx]  # Fall back to position if the model mangled the path
+        if item is None:
+            split.append(None)
+        else:
+            split.append(json.dumps({key: value for key, value in item.items() if key != "file"}))
+    return split
+
+def _entry_size(entry):
+    """Size of a DirEntry's file, or 0 if it cannot be stat-ed."""
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return 0
+
 def find_top_script_files(directory, ignore_patterns, base_dir, count=3, config=None):
-    """Find the top script files for analysis based on various criteria."""
+    """
+    Find the top script files for analysis: the largest substantial file of each
+    source directory, at most ``count`` of them, largest first.
+    """
     source_dirs = get_configured_source_dirs(config) if config else {"src", "app", "main"}
-    all_source_dirs = find_all_source_dirs(directory, source_dirs, ignore_patterns, base_dir, config)
     
-    # Store the top file found for each source directory
-    top_files_per_dir = {str(path): (0, 0, None) for path in all_source_dirs}
+    # Store the top file found for each source directory, in discovery order
+    top_files_per_dir = {}
+    # Source directories enclosing each directory still to be walked; a single walk
+    # of the tree both discovers the source directories and scans their files
+    enclosing_source_dirs = {directory: ()}
+    # Files inside a source directory, with the source directories enclosing them
+    candidates = []
+    ignored = make_ignore_matcher(ignore_patterns, base_dir, config)
     
-    if not all_source_dirs:
+    for root, dirs, files in scandir_walk(directory):
+        enclosing = enclosing_source_dirs.pop(root, ())
+        # Remove ignored directories in-place
+        dirs[:] = [d for d in dirs if not ignored(d.path, is_dir=True)]
+        
+        for d in dirs:
+            if d.name in source_dirs:
+                top_files_per_dir[d.path] = (0, None)
+                enclosing_source_dirs[d.path] = enclosing + (d.path,)
+            else:
+                enclosing_source_dirs[d.path] = enclosing
+        
+        if not enclosing:
+            continue
+        
+        for file in files:
+            # Images, archives and the like are skipped without being opened
+            if not has_binary_extension(file.name) and not ignored(file.path):
+                candidates.append((file, enclosing))
+    
+    # Reading the candidates is I/O-bound, so overlap it across threads. The largest
+    # files are started first so none of them is left running alone at the end.
+    by_size = sorted(range(len(candidates)), key=lambda i: _entry_size(candidates[i][0]), reverse=True)
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        # One open per file covers both the binary check and the line count;
+        # the DirEntry supplies the size without another stat on most platforms
+        file_infos = dict(zip(by_size, executor.map(
+            lambda i: analyze_file(candidates[i][0], with_hash=False), by_size)))
+    
+    # Rank in discovery order, so ties go to the same file as a sequential scan
+    for i, (file, enclosing) in enumerate(candidates):
+        file_info = file_infos[i]
+        if file_info.is_binary:
+            continue
+        
+        line_count = file_info.line_count
+        if line_count > 50:  # Only consider substantial files
+            for source_dir in enclosing:
+                if line_count > top_files_per_dir[source_dir][0]:
+                    top_files_per_dir[source_dir] = (line_count, file.path)
+    
+    if not top_files_per_dir:
         print(f"{YELLOW}Warning: No source directories found. Analyzing project root as fallback.{RESET}")
         return []
     
-    now = time.time()
-    for search_path in all_source_dirs:
-        for root, dirs, files in os.walk(search_path):
-            # Remove ignored directories in-place
-            from .utils import should_ignore
-            dirs[:] = [d for d in dirs if not should_ignore(
-                os.path.join(root, d), ignore_patterns, base_dir, config)]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                if (not should_ignore(file_path, ignore_patterns, base_dir, config) and
-                    not is_binary_file(file_path)):
-                    
-                    line_count = count_lines(file_path)
-                    if line_count > 50:  # Only consider substantial files
-                        current_max = top_files_per_dir[search_path][0]
-                        if line_count > current_max:
-                            top_files_per_dir[search_path] = (line_count, line_count, file_path)
-    
     # Collect results
     final_files = []
-    for _, line_count, file_path in top_files_per_dir.values():
+    for line_count, file_path in top_files_per_dir.values():
         if file_path:
             final_files.append((line_count, file_path))
     
-    final_files.sort(key=lambda item: item[0], reverse=True)
-    return final_files
+    # Only count files are kept, so a bounded heap replaces a full sort
+    return heapq.nlargest(count, final_files, key=lambda item: item[0])
+
+# Limits for a Python file to pass the local review without an LLM call
+LOCAL_REVIEW_MAX_FUNCTION_LINES = 40
+LOCAL_REVIEW_MAX_FUNCTION_BRANCHES = 10
+_BRANCH_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try, ast.IfExp, ast.BoolOp)
+_WORK_MARKER_RE = re.compile(r'\b(?:TODO|FIXME|XXX|HACK)\b')
+# What the review prompt asks for when there are no smells: nothing to praise or fix
+LOCAL_CLEAN_REVIEW = json.dumps({"positive_points": [], "refactoring_suggestions": []})
+
+def looks_clean_locally(file_path, file_content):
+    """
+    Cheap local check that a Python file has nothing for a code review to flag:
+    it parses, no function is long or heavily branched, no top-level name is
+    defined twice and no TODO/FIXME-style markers remain.
+    """
+    if not file_path.endswith(".py") or _WORK_MARKER_RE.search(file_content):
+        return False
+    try:
+        tree = ast.parse(file_content)
+    except (SyntaxError, ValueError):
+        return False
+    
+    top_level_names = [node.name for node in tree.body
+                       if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))]
+    if len(top_level_names) != len(set(top_level_names)):
+        return False
+    
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        if node.end_lineno - node.lineno + 1 > LOCAL_REVIEW_MAX_FUNCTION_LINES:
+            return False
+        branches = sum(isinstance(child, _BRANCH_NODES) for child in ast.walk(node))
+        if branches > LOCAL_REVIEW_MAX_FUNCTION_BRANCHES:
+            return False
+    return True
+
+def _print_llm_result(result, output_label, schema=None):
+    """Parse an AI response and pretty-print it for the given analysis type."""
+    try:
+        if result.lstrip().startswith(('{', '```')):
+            parsed_result = parse_llm_json(result)
+            if not isinstance(parsed_result, dict):
+                raise json.JSONDecodeError("Expected a JSON object", result, 0)
+
+            if "error" in parsed_result:
+                print(f"{RED}✖ AI analysis failed: {parsed_result['error']}{RESET}")
+                return
+
+            validator = get_schema_validator(schema)
+            if validator is not None and not validator.is_valid(parsed_result):
+                print(f"{YELLOW}⚠ AI response does not match the expected schema{RESET}")
+            
+            if output_label == "Summary":
+                summary = parsed_result.get("summary", "No summary available")
+                print(f"{BLUE}Summary:{RESET} {summary}")
+                
+            elif output_label == "Review":
+                positive_points = parsed_result.get("positive_points", [])
+                suggestions = parsed_result.get("refactoring_suggestions", [])
+                
+                if positive_points:
+                    print(f"{GREEN}✓ Positive Points:{RESET}")
+                    for point in positive_points:
+                        print(f"  • {point}")
+                
+                if suggestions:
+                    print(f"{YELLOW}⚠ Refactoring Suggestions:{RESET}")
+                    for suggestion in suggestions:
+                        smell = suggestion.get("smell", "Unknown")
+                        explanation = suggestion.get("explanation", "")
+                        fix = suggestion.get("suggestion", "")
+                        print(f"  • {BOLD}{smell}:{RESET} {explanation}")
+                        if fix:
+                            print(f"    → {fix}")
+                
+                if not positive_points and not suggestions:
+                    print(f"{GREEN}✓ Code looks clean!{RESET}")
+                    
+        else:
+            print(f"{GREY}Raw response: {result}{RESET}")
+            
+    except json.JSONDecodeError:
+        print(f"{RED}✖ Failed to parse AI response as JSON{RESET}")
+        print(f"{GREY}Raw response: {result[:200]}...{RESET}")
 
 def run_llm_analysis_on_top_files(directory, system_prompt, output_label, schema=None, config=None):
     """Run LLM analysis on top files in the project."""
@@ -138,79 +507,87 @@ def run_llm_analysis_on_top_files(directory, system_prompt, output_label, schema
         return
     
     cache = load_cache()
-    cache_updated = False
     project_context = config.get("project_context", "This file is part of a software project.") if config else "This file is part of a software project."
+    local_review_max_lines = get_configured_llm_local_review_max_lines(config) if config and output_label == "Review" else 0
     
-    for idx, (line_count, file_path) in enumerate(top_files, 1):
-        print(f"\n{BOLD}File {idx}: {os.path.relpath(file_path, directory)} ({line_count} lines){RESET}")
-        
-        file_hash = get_file_md5(file_path)
+    # Collect the files whose results are not cached yet, so they can be sent together
+    entries = []
+    pending = []
+    for line_count, file_path in top_files:
+        # A single read yields both the cache-key hash and the prompt content
+        try:
+            file_content, file_hash = read_file_with_md5(file_path)
+            read_error = None
+        except Exception as e:
+            file_content, file_hash, read_error = None, None, e
         cache_key = f"{file_path}|{file_hash}|{output_label}"
         cached_result = cache.get(cache_key)
+        if cached_result and _llm_error(cached_result) is not None:
+            cached_result = None  # Error responses cached by older versions are retried
+        entry = {"file_path": file_path, "line_count": line_count, "cache_key": cache_key,
+                 "result": cached_result, "cached": bool(cached_result), "error": None,
+                 "local": False, "relative_path": os.path.relpath(file_path, directory)}
+        entries.append(entry)
+        if entry["cached"]:
+            continue
+
+        if read_error is not None:
+            entry["error"] = read_error
+            continue
         
-        if cached_result:
-            print(f"{GREEN}✓ Using cached result{RESET}")
-            result = cached_result
-        else:
-            print(f"{GREY}Analyzing with AI...{RESET}")
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    file_content = f.read()
-            except Exception as e:
-                print(f"{RED}✖ Error reading file: {e}{RESET}")
-                continue
-            
-            # Prepare the prompt
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Context: {project_context}\n\nFile: {os.path.relpath(file_path, directory)}\n\nCode:\n{file_content}"}
-            ]
-            
-            result = call_llm(messages, schema)
-            cache[cache_key] = result
-            cache_updated = True
+        if line_count <= local_review_max_lines and looks_clean_locally(file_path, file_content):
+            # Not cached: the answer is cheap to recompute and must not outlive the setting
+            entry["result"] = LOCAL_CLEAN_REVIEW
+            entry["local"] = True
+            continue
         
-        # Parse and display results
-        try:
-            if result.startswith('{"') or result.startswith('{'):
-                parsed_result = json.loads(result)
-                
-                if output_label == "Summary":
-                    summary = parsed_result.get("summary", "No summary available")
-                    print(f"{BLUE}Summary:{RESET} {summary}")
-                    
-                elif output_label == "Review":
-                    positive_points = parsed_result.get("positive_points", [])
-                    suggestions = parsed_result.get("refactoring_suggestions", [])
-                    
-                    if positive_points:
-                        print(f"{GREEN}✓ Positive Points:{RESET}")
-                        for point in positive_points:
-                            print(f"  • {point}")
-                    
-                    if suggestions:
-                        print(f"{YELLOW}⚠ Refactoring Suggestions:{RESET}")
-                        for suggestion in suggestions:
-                            smell = suggestion.get("smell", "Unknown")
-                            explanation = suggestion.get("explanation", "")
-                            fix = suggestion.get("suggestion", "")
-                            print(f"  • {BOLD}{smell}:{RESET} {explanation}")
-                            if fix:
-                                print(f"    → {fix}")
-                    
-                    if not positive_points and not suggestions:
-                        print(f"{GREEN}✓ Code looks clean!{RESET}")
-                        
+        pending.append((entry, file_content))
+    
+    if pending:
+        print(f"{GREY}Analyzing {len(pending)} file(s) with AI...{RESET}")
+        batch_size = get_configured_llm_batch_size(config) if config else 1
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        requests = []
+        for batch in batches:
+            if len(batch) == 1:
+                entry, file_content = batch[0]
+                messages = [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"Context: {project_context}\n\nFile: {entry['relative_path']}\n\nCode:\n{file_content}"}
+                ]
+                requests.append((messages, schema))
             else:
-                print(f"{GREY}Raw response: {result}{RESET}")
-                
-        except json.JSONDecodeError:
-            print(f"{RED}✖ Failed to parse AI response as JSON{RESET}")
-            print(f"{GREY}Raw response: {result[:200]}...{RESET}")
+                files = [(entry["relative_path"], file_content) for entry, file_content in batch]
+                requests.append((_build_batch_messages(system_prompt, project_context, files), _batch_schema(schema)))
+
+        max_concurrency = get_configured_llm_max_concurrency(config) if config else 8
+        results = _run_llm_requests(requests, max_concurrency)
+
+        for batch, result in zip(batches, results):
+            if len(batch) == 1:
+                per_file_results = [result]
+            else:
+                per_file_results = _split_batch_result(result, [entry["relative_path"] for entry, _ in batch])
+            for (entry, _), file_result in zip(batch, per_file_results):
+                if file_result is None:
+                    # Never hand the whole batch response to the per-file printer; report
+                    # the file as not analysed, and leave it uncached so the next run retries
+                    error = _llm_error(result) or "File not covered by the batched AI response"
+                    entry["result"] = json.dumps({"error": error})
+                    continue
+                entry["result"] = file_result
+                _cache_llm_response(entry["cache_key"], file_result)
     
-    if cache_updated:
-        save_cache(cache)
+    for idx, entry in enumerate(entries, 1):
+        print(f"\n{BOLD}File {idx}: {entry['relative_path']} ({entry['line_count']} lines){RESET}")
+        if entry["error"] is not None:
+            print(f"{RED}✖ Error reading file: {entry['error']}{RESET}")
+            continue
+        if entry["cached"]:
+            print(f"{GREEN}✓ Using cached result{RESET}")
+        elif entry["local"]:
+            print(f"{GREEN}✓ Reviewed locally, no AI call needed{RESET}")
+        _print_llm_result(entry["result"], output_label, schema)
 
 def run_llm_summarization(directory, config=None):
     """Run LLM-powered code summarization."""
@@ -8,7 +8,7 @@ import os
 from typing import List, Dict, Any, Optional
 
 # --- Main project dependencies ---
-from .dependency_analysis import DependencyGraph, ImportParser, load_cached_dependency_graph, save_dependency_graph_cache
+from .dependency_analysis import DependencyGraph, parse_imports_in_parallel, load_cached_dependency_graph, save_dependency_graph_cache
 from .utils import load_cache, save_cache, get_project_hash
 from .config import get_configured_source_dirs, SCRIPT_EXTS, load_config
 
@@ -68,7 +68,7 @@ class ArchitecturalSniffer:
         # Ensure all file_paths are absolute and within the project root
         absolute_file_paths = []
         for p in file_paths:
-            if Path(p).is_absolute():
+            if os.path.isabs(p):
                 abs_p = Path(p)
             else:
                 # Use the resolver to get a consistent absolute path
@@ -126,9 +126,8 @@ class ArchitecturalSniffer:
 
         git_smells = []
         if self.git_analyzer.has_git_repo():
-            git_smells.extend(self.git_analyzer.check_stale_logic(absolute_file_paths))
-            git_smells.extend(self.git_analyzer.check_high_churn(absolute_file_paths))
-            git_smells.extend(self.git_analyzer.check_stale_tests(absolute_file_paths))
+            # One pass over the files covers stale logic, high churn and stale tests
+            git_smells.extend(self.git_analyzer.run_all_checks(absolute_file_paths))
 
         self.smells = converted_pattern_smells + git_smells
 
@@ -204,23 +203,29 @@ class ArchitecturalSniffer:
         all_project_files_set = {str(p) for p in file_paths} # Convert to string for set lookups
 
         source_dirs = get_configured_source_dirs(self.config)
-        for file_path in file_paths:
-            # Use FileClassifier to determine if it's a source file
-            classifications = self.file_classifier.classify_file(str(file_path))
-            if "source" in classifications:
-                # ImportParser needs the project root for absolute imports and path resolution
-                imports = ImportParser.get_file_imports(str(file_path), str(self.project_root))
-                for import_name in imports:
-                    # Delegate import resolution to a helper, using WorkspaceResolver
-                    resolved_path = self.workspace_resolver.resolve_import(
-                        import_name,
-                        file_path,
-                        source_dirs,
-                        SCRIPT_EXTS
-                    )
-                    if resolved_path and str(resolved_path) in all_project_files_set:
-                        graph.add_dependency(file_path, resolved_path)
-
+        # Answer import-resolution existence checks from the known file set instead of stat calls
+        self.workspace_resolver.set_file_index(all_project_files_set)
+        # Use FileClassifier to determine which files are source files
+        source_files = [
+            file_path for file_path in file_paths
+            if "source" in self.file_classifier.classify_file(str(file_path))
+        ]
+        # ImportParser needs the project root for absolute imports and path resolution.
+        # Parsing is CPU-bound and independent per file, so it is spread across processes.
+        for file_path, imports in parse_imports_in_parallel(source_files, self.project_root):
+            file_path = Path(file_path)
+            for import_name in imports:
+                # Delegate import resolution to a helper, using WorkspaceResolver
+                resolved_path = self.workspace_resolver.resolve_import(
+                    import_name,
+                    file_path,
+                    source_dirs,
+                    SCRIPT_EXTS
+                )
+                if resolved_path and str(resolved_path) in all_project_files_set:
+                    graph.add_dependency(file_path, resolved_path)
+
+        graph.finalize()
         save_dependency_graph_cache(graph, project_hash)
         print("Dependency graph cached.")
         return graph
\ No newline at end of file
@@ -3,7 +3,9 @@ Configuration constants and settings for Project Analyzer.
 """
 
 import os
+import copy
 import json
+import functools
 import threading
 from pathlib import Path
 
@@ -32,6 +34,8 @@ SCRIPT_EXTS = {
     '.pl', '.go', '.rs', '.java', '.c', '.cpp', '.h', '.cs', '.m', '.swift', 
     '.kt', '.dart'
 }
+# Same extensions as a tuple, for a single C-level str.endswith() check per file name
+SCRIPT_EXTS_TUPLE = tuple(sorted(SCRIPT_EXTS))
 
 DATA_EXTS = {
     '.json', '.csv', '.yml', '.yaml', '.xml', '.txt', '.md', '.ini', '.conf', '.log'
@@ -61,7 +65,7 @@ ARCHITECTURAL_SMELLS = {
 PROJECT_ROOT = os.getcwd()
 CACHE_FILE = os.path.join(PROJECT_ROOT, "cache", ".analyzer-cache.json")
 CONFIG_FILE = os.path.join(PROJECT_ROOT, ".analyzer-config.json")
-_cache_lock = threading.Lock()
+_cache_lock = threading.RLock()
 
 # AI schemas
 CODE_REVIEW_SCHEMA = {
@@ -143,6 +147,9 @@ DEFAULT_CONFIG = {
     ],
     "exclude_patterns": [],
     "llm_review_file_count": 3,
+    "llm_max_concurrency": 8,
+    "llm_batch_size": 1,
+    "llm_local_review_max_lines": 0,
     "untestable_patterns": [],
     "utility_patterns": []
 }
@@ -152,23 +159,46 @@ DEFAULT_CONFIG = {
 # CONFIGURATION MANAGEMENT
 # =============================================================================
 
+# ((mtime_ns, size), parsed config) of the last successful load_config() read
+_loaded_config = None
+
 def load_config():
-    """Load configuration from .analyzer-config.json if it exists."""
-    if not os.path.exists(CONFIG_FILE):
+    """
+    Load configuration from .analyzer-config.json if it exists.
+    The parsed file is reused until its modification time or size changes.
+    Each call returns its own deep copy, so callers may modify nested values.
+    """
+    global _loaded_config
+    try:
+        stat = os.stat(CONFIG_FILE)
+    except OSError:
         return {}
+
+    file_key = (stat.st_mtime_ns, stat.st_size)
+    if _loaded_config is not None and _loaded_config[0] == file_key:
+        return copy.deepcopy(_loaded_config[1])
+
     try:
         with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+            config = json.load(f)
     except Exception:
         return {}
 
+    _loaded_config = (file_key, config)
+    return copy.deepcopy(config)
+
 def get_configured_source_dirs(config):
     """Get configured source directories."""
     return set(config.get("source_dirs", DEFAULT_CONFIG["source_dirs"]))
 
+@functools.lru_cache(maxsize=None)
+def _frozen_excluded_dirs(exclude_dirs):
+    """Build the excluded-directory set once per distinct configuration."""
+    return frozenset(exclude_dirs)
+
 def get_configured_excluded_dirs(config):
     """Get configured excluded directories."""
-    return set(config.get("exclude_dirs", DEFAULT_CONFIG["exclude_dirs"]))
+    return _frozen_excluded_dirs(tuple(config.get("exclude_dirs", DEFAULT_CONFIG["exclude_dirs"])))
 
 def get_configured_exclude_patterns(config):
     """Get configured exclusion patterns."""
@@ -178,6 +208,18 @@ def get_configured_llm_review_file_count(config):
     """Get number of files to review with LLM."""
     return int(config.get("llm_review_file_count", DEFAULT_CONFIG["llm_review_file_count"]))
 
+def get_configured_llm_max_concurrency(config):
+    """Get the maximum number of LLM requests to have in flight at once."""
+    return max(1, int(config.get("llm_max_concurrency", DEFAULT_CONFIG["llm_max_concurrency"])))
+
+def get_configured_llm_batch_size(config):
+    """Get number of files to send to the LLM in a single prompt."""
+    return max(1, int(config.get("llm_batch_size", DEFAULT_CONFIG["llm_batch_size"])))
+
+def get_configured_llm_local_review_max_lines(config):
+    """Get the line limit under which simple Python files are reviewed locally instead of by the LLM (0 disables)."""
+    return max(0, int(config.get("llm_local_review_max_lines", DEFAULT_CONFIG["llm_local_review_max_lines"])))
+
 def get_configured_untestable_patterns(config):
     """Get configured untestable file patterns."""
     return set(config.get("untestable_patterns", DEFAULT_CONFIG["untestable_patterns"]))
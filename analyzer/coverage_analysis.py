@@ -6,7 +6,15 @@ import os
 import json
 import subprocess
 
+# Optional dependency
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
 from .config import BOLD, RESET, YELLOW, GREEN, RED, GREY
+from .utils import load_json_file
 
 # =============================================================================
 # TEST COVERAGE ANALYSIS
@@ -18,14 +26,26 @@ def is_jest_project(directory):
     if not os.path.exists(package_json_path):
         return False
     try:
-        with open(package_json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json_file(package_json_path)
         deps = data.get("dependencies", {})
         dev_deps = data.get("devDependencies", {})
         return "jest" in deps or "jest" in dev_deps or "jest" in data
     except (json.JSONDecodeError, IOError):
         return False
 
+def read_line_coverage_pct(coverage_file):
+    """
+    Read the overall line coverage from a Jest coverage-summary.json.
+
+    With ijson the file is parsed only up to ``total.lines.pct``; Jest writes the
+    ``total`` entry first, so the per-file entries of large summaries are skipped.
+    """
+    if HAS_IJSON:
+        with open(coverage_file, "rb") as f:
+            return next(ijson.items(f, "total.lines.pct", use_float=True), 0)
+    data = load_json_file(coverage_file)
+    return data.get("total", {}).get("lines", {}).get("pct", 0)
+
 def run_jest_coverage(directory):
     """Run Jest coverage analysis."""
     print(f"\n{BOLD}--- Jest Coverage Analysis ---{RESET}")
@@ -49,11 +69,7 @@ def run_jest_coverage(directory):
         print(f"{YELLOW}  Hint: Ensure your jest.config.js has 'json-summary' in coverageReport.{RESET}")
         return None
     
-    with open(coverage_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    total_coverage = data.get("total", {})
-    lines_pct = total_coverage.get("lines", {}).get("pct", 0)
+    lines_pct = read_line_coverage_pct(coverage_file)
     color = GREEN if lines_pct >= 70 else YELLOW if lines_pct >= 50 else RED
     
     return f"  Overall Line Coverage: {color}{lines_pct:.2f}%{RESET}\n{GREY}------------------------------------{RESET}"
@@ -4,10 +4,13 @@ Dependency analysis for building and analyzing file dependency relationships.
 
 import os
 import re
+import sys
 import json
 import time
 from pathlib import Path
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from .utils import read_file_content, load_cache, save_cache
 
@@ -16,7 +19,11 @@ from .utils import read_file_content, load_cache, save_cache
 # =============================================================================
 
 class DependencyGraph:
-    """Builds and analyzes dependency relationships between files."""
+    """
+    Builds and analyzes dependency relationships between files.
+
+    Files are stored as path strings; Path arguments are converted on the way in.
+    """
     
     def __init__(self):
         self.imports = defaultdict(set)  # file -> set of files it imports
@@ -25,14 +32,30 @@ class DependencyGraph:
         
     def add_dependency(self, from_file, to_file):
         """Add a dependency relationship."""
+        # Each path is stored in several dicts and sets; interning keeps a single
+        # copy of every path string and lets hashing/equality short-circuit on identity.
+        from_file = sys.intern(str(from_file))
+        to_file = sys.intern(str(to_file))
         self.imports[from_file].add(to_file)
         self.imported_by[to_file].add(from_file)
         self.all_files.add(from_file)
         self.all_files.add(to_file)
     
+    def finalize(self):
+        """
+        Freeze the adjacency lists once graph construction is complete.
+
+        Tuples are far smaller than sets for the short neighbour lists typical of
+        import graphs and iterate faster during traversal. No dependencies may be
+        added after the graph has been finalized. Looking up a file with no edges
+        still yields an empty (tuple) neighbour list, as before.
+        """
+        self.imports = defaultdict(tuple, {k: tuple(v) for k, v in self.imports.items()})
+        self.imported_by = defaultdict(tuple, {k: tuple(v) for k, v in self.imported_by.items()})
+    
     def get_import_count(self, file_path):
         """Get number of files that import this file."""
-        return len(self.imported_by[file_path])
+        return len(self.imported_by.get(str(file_path), ()))
     
     def find_circular_dependencies(self):
         """Find circular dependencies using DFS."""
@@ -55,7 +78,7 @@ class DependencyGraph:
             rec_stack.add(node)
             path.append(node)
             
-            for neighbor in self.imports[node]:
+            for neighbor in self.imports.get(node, ()):
                 dfs(neighbor, path)
             
             path.pop()
@@ -114,7 +137,7 @@ class ImportParser:
     @staticmethod
     def get_file_imports(file_path, project_root):
         """Get imports for a file based on its extension."""
-        ext = Path(file_path).suffix.lower()
+        ext = os.path.splitext(str(file_path))[1].lower()
         
         if ext == '.py':
             return ImportParser.parse_python_imports(file_path, project_root)
@@ -123,19 +146,37 @@ class ImportParser:
         else:
             return []
 
-def find_all_source_dirs(root_path, source_dirs, ignore_patterns, base_dir, config=None):
-    """Recursively find all directories matching source directory names."""
-    from .utils import should_ignore
-    
-    matches = []
-    for dirpath, dirnames, _ in os.walk(root_path):
-        # Remove ignored directories in-place
-        dirnames[:] = [d for d in dirnames if not should_ignore(
-            os.path.join(dirpath, d), ignore_patterns, base_dir, config)]
-        for d in dirnames:
-            if d in source_dirs:
-                matches.append(os.path.join(dirpath, d))
-    return matches
+# Below this many files the cost of starting worker processes outweighs the parsing work
+PARALLEL_PARSE_MIN_FILES = 64
+
+def _parse_one(path_and_root):
+    """Parse the imports of a single file (module-level so it can be pickled by worker processes)."""
+    file_path, project_root = path_and_root
+    # Tuples pickle more cheaply than lists or sets on the way back to the parent
+    return file_path, tuple(ImportParser.get_file_imports(file_path, project_root))
+
+def parse_imports_in_parallel(file_paths, project_root):
+    """
+    Parse imports for many files, spreading the work across CPU cores.
+
+    Yields (file_path, imports) tuples in the order of file_paths. Inputs too small to
+    repay process start-up, and environments where worker processes cannot be started,
+    are parsed on a thread pool instead, which still overlaps the file reads.
+    """
+    tasks = [(str(file_path), str(project_root)) for file_path in file_paths]
+    if len(tasks) >= PARALLEL_PARSE_MIN_FILES:
+        try:
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(_parse_one, tasks, chunksize=32))
+            yield from results
+            return
+        except (OSError, BrokenProcessPool):
+            pass
+    if len(tasks) <= 1:
+        yield from map(_parse_one, tasks)
+        return
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        yield from executor.map(_parse_one, tasks)
 
 def load_cached_dependency_graph(project_hash):
     """Load cached dependency graph if it exists and is valid."""
@@ -153,6 +194,7 @@ def load_cached_dependency_graph(project_hash):
                 for from_file, to_files in imports_data.items():
                     for to_file in to_files:
                         graph.add_dependency(from_file, to_file)
+                graph.finalize()
                 return graph
         except Exception:
             pass
@@ -7,6 +7,7 @@ It is designed to be a missing dependency that GitAnalyzer needs.
 """
 
 import os
+import re
 import fnmatch
 from typing import List, Dict, Any
 from .config import DEFAULT_CONFIG
@@ -37,6 +38,11 @@ class FileClassifier:
         self.config_patterns = config.get("config_file_patterns", DEFAULT_CONFIG["config_file_patterns"])
         self.ignore_patterns = config.get("ignore_file_patterns", DEFAULT_CONFIG["ignore_file_patterns"])
         self.project_lifecycle_patterns = config.get("project_lifecycle_patterns", DEFAULT_CONFIG["project_lifecycle_patterns"])
+        # Glob pattern -> compiled regex, so each pattern is translated only once
+        self._compiled_patterns: Dict[str, re.Pattern] = {}
+        # Basename -> classifications; patterns only look at the basename, so every
+        # path sharing one classifies identically and later checks reuse the result
+        self._classification_cache: Dict[str, tuple] = {}
 
     def classify_file(self, file_path: str) -> List[str]:
         """
@@ -49,24 +55,40 @@ class FileClassifier:
             List[str]: A list of categories the file belongs to (e.g., ['source', 'python', 'backend']).
                        Returns an empty list if no classification matches.
         """
-        classifications = []
         file_name = os.path.basename(file_path)
+        cached = self._classification_cache.get(file_name)
+        if cached is None:
+            cached = tuple(self._classify_file_name(file_name))
+            self._classification_cache[file_name] = cached
+        return list(cached)
+
+    def _classify_file_name(self, file_name: str) -> List[str]:
+        """
+        Computes the classifications for a file name; see classify_file().
+
+        Args:
+            file_name (str): The base name of the file.
+
+        Returns:
+            List[str]: The sorted, de-duplicated categories for the file.
+        """
+        classifications = []
         file_extension = os.path.splitext(file_name)[1].lower()
 
         # Check ignore patterns first
-        if self._matches_pattern(file_path, self.ignore_patterns):
+        if self._matches_pattern(file_name, self.ignore_patterns):
             return []  # Ignore this file
 
         # More specific classifications first
-        if self._matches_pattern(file_path, self.project_lifecycle_patterns):
+        if self._matches_pattern(file_name, self.project_lifecycle_patterns):
             classifications.append("project_lifecycle")
-        if self._matches_pattern(file_path, self.documentation_patterns):
+        if self._matches_pattern(file_name, self.documentation_patterns):
             classifications.append("documentation")
-        if self._matches_pattern(file_path, self.config_patterns):
+        if self._matches_pattern(file_name, self.config_patterns):
             classifications.append("config")
-        if self._matches_pattern(file_path, self.test_patterns):
+        if self._matches_pattern(file_name, self.test_patterns):
             classifications.append("test")
-        if self._matches_pattern(file_path, self.source_patterns):
+        if self._matches_pattern(file_name, self.source_patterns):
             classifications.append("source")
 
         # Basic language classification based on extension
@@ -123,9 +145,14 @@ class FileClassifier:
         Returns:
             bool: True if the file path matches any pattern, False otherwise.
         """
-        file_name = os.path.basename(file_path)
+        # normcase mirrors fnmatch.fnmatch's case-insensitivity on Windows
+        file_name = os.path.normcase(os.path.basename(file_path))
 
         for pattern in patterns:
-            if fnmatch.fnmatch(file_name, pattern):
+            compiled = self._compiled_patterns.get(pattern)
+            if compiled is None:
+                compiled = re.compile(fnmatch.translate(os.path.normcase(pattern)))
+                self._compiled_patterns[pattern] = compiled
+            if compiled.match(file_name):
                 return True
         return False
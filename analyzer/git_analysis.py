@@ -3,10 +3,11 @@
 #
 
 from pathlib import Path
+import os
 import time
 from datetime import datetime, timedelta, timezone
 import sys
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Optional dependency
 try:
@@ -21,6 +22,13 @@ from .config import get_configured_source_dirs, DEFAULT_CONFIG
 from .decorators import cache_result
 from .smell_factory import create_smell
 
+# Opened repositories by resolved project root; git.Repo parses the repository
+# config on construction, so every GitAnalyzer for the same root shares one
+_repo_cache: Dict[str, Any] = {}
+
+# Extensions considered when pairing source files with their tests
+TEST_FILE_EXTS = frozenset({".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go"})
+
 class GitAnalyzer:
     """
     Handles all Git-based analysis, such as code churn, stale logic, and stale tests.
@@ -40,22 +48,72 @@ class GitAnalyzer:
         self.config = config
         self.file_classifier = file_classifier # Dependency is injected
         self.repo = self._get_repo()
+        self._commit_index: Optional[Dict[str, List[int]]] = None
+        self._repo_root: Optional[str] = None # Resolved working tree that git log paths are relative to
 
     def _get_repo(self):
         """Initializes the Git repository object, returns None if not found."""
         if not HAS_GIT:
             print("Warning: GitPython not found. Git-based checks will be skipped.", file=sys.stderr)
             return None
+        root_key = os.path.realpath(self.project_root)
+        repo = _repo_cache.get(root_key)
+        if repo is not None and os.path.isdir(repo.git_dir):
+            return repo
         try:
-            return git.Repo(self.project_root)
-        except git.exc.InvalidGitRepositoryError:
+            repo = git.Repo(self.project_root)
+        except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError):
             print("Warning: Not a valid Git repository. Git-based checks will be skipped.", file=sys.stderr)
             return None
+        # Only successes are cached, so a repository initialised later is still picked up
+        _repo_cache[root_key] = repo
+        return repo
 
     def has_git_repo(self) -> bool:
         """Checks if a valid Git repository is available."""
         return self.repo is not None
 
+    def _load_commit_index(self) -> Dict[str, List[int]]:
+        """
+        Reads the whole history with a single `git log --name-only` and maps each
+        repo-relative path to its commit timestamps, newest first. This replaces a
+        separate history walk per file and per check.
+        """
+        if self._commit_index is not None:
+            return self._commit_index
+
+        commit_index: Dict[str, List[int]] = {}
+        try:
+            output = self.repo.git.execute([
+                'git', '-c', 'core.quotepath=off', 'log',
+                '--name-only', '--pretty=format:__COMMIT__ %H %ct',
+            ])
+        except git.exc.GitCommandError:
+            # e.g. a repository without any commits yet
+            output = ''
+
+        timestamp = None
+        for line in output.splitlines():
+            if line.startswith('__COMMIT__ '):
+                timestamp = int(line.rsplit(' ', 1)[1])
+            elif line and timestamp is not None:
+                commit_index.setdefault(line, []).append(timestamp)
+
+        self._repo_root = os.path.join(os.path.realpath(self.repo.working_tree_dir), '')
+        self._commit_index = commit_index
+        return commit_index
+
+    def _get_commit_timestamps(self, file_path) -> List[int]:
+        """Returns the commit timestamps (newest first) recorded for a file."""
+        commit_index = self._load_commit_index()
+        real_path = os.path.realpath(file_path)
+        if not real_path.startswith(self._repo_root):
+            return []
+        relative_path = real_path[len(self._repo_root):]
+        if os.sep != '/':
+            relative_path = relative_path.replace(os.sep, '/')
+        return commit_index.get(relative_path, [])
+
     # --- TDD ANCHOR: Test stale logic with old, new, and untracked files ---
     @cache_result(expiry_seconds=86400)
     def check_stale_logic(self, file_paths: List[Path]) -> List[Dict[str, Any]]:
@@ -71,30 +129,12 @@ class GitAnalyzer:
         if not self.has_git_repo():
             return []
 
+        settings = self._stale_logic_settings()
         smells = []
-        threshold_days = self.config.get('stale_logic_threshold_days', DEFAULT_CONFIG['stale_logic_threshold_days'])
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=threshold_days)
-
-        for file_path in file_paths:
-            classifications = self.file_classifier.classify_file(str(file_path))
-            if "source" in classifications:
-                try:
-                    # Get the last commit date for the file
-                    last_commit = next(self.repo.iter_commits(paths=str(file_path), max_count=1))
-                    last_commit_date = last_commit.committed_datetime
-
-                    if last_commit_date < cutoff_date:
-                        smells.append(create_smell(
-                            smell_type='STALE_LOGIC',
-                            file_path=str(file_path),
-                            message=f"Source file has not been modified in {threshold_days} days.",
-                            severity='Low',
-                            category='Git Analysis'
-                        ))
-                except (StopIteration, git.exc.GitCommandError):
-                    # File might be untracked or no commits exist for it
-                    continue
-
+        for file_path in self._source_files(file_paths):
+            smell = self._check_stale_logic_one(file_path, self._get_commit_timestamps(file_path), settings)
+            if smell:
+                smells.append(smell)
         return smells
 
     @cache_result(expiry_seconds=86400)
@@ -111,27 +151,12 @@ class GitAnalyzer:
         if not self.has_git_repo():
             return []
 
+        settings = self._high_churn_settings()
         smells = []
-        days = self.config.get('high_churn_days', DEFAULT_CONFIG['high_churn_days'])
-        threshold_commits = self.config.get('high_churn_threshold', DEFAULT_CONFIG['high_churn_threshold'])
-        since_date = datetime.now() - timedelta(days=days)
-
-        for file_path in file_paths:
-            classifications = self.file_classifier.classify_file(str(file_path))
-            if "source" in classifications:
-                try:
-                    commits = list(self.repo.iter_commits(paths=str(file_path), since=since_date))
-                    if len(commits) >= threshold_commits:
-                        smells.append(create_smell(
-                            smell_type='HIGH_CHURN',
-                            file_path=str(file_path),
-                            message=f"High churn: {len(commits)} commits in the last {days} days.",
-                            severity='Medium',
-                            category='Git Analysis'
-                        ))
-                except git.exc.GitCommandError:
-                    continue
-
+        for file_path in self._source_files(file_paths):
+            smell = self._check_high_churn_one(file_path, self._get_commit_timestamps(file_path), settings)
+            if smell:
+                smells.append(smell)
         return smells
 
     @cache_result(expiry_seconds=86400)
@@ -148,93 +173,179 @@ class GitAnalyzer:
         if not self.has_git_repo():
             return []
 
+        test_index = self._build_test_index(file_paths)
         smells = []
-        all_files_str_set = {str(p) for p in file_paths}
+        for file_path in self._source_files(file_paths):
+            smell = self._check_stale_tests_one(file_path, self._get_commit_timestamps(file_path), test_index)
+            if smell:
+                smells.append(smell)
+        return smells
+
+    @cache_result(expiry_seconds=86400)
+    def run_all_checks(self, file_paths: List[Path]) -> List[Dict[str, Any]]:
+        """
+        Runs the stale logic, high churn and stale tests checks in a single pass,
+        classifying and looking up the history of each file only once.
+
+        Args:
+            file_paths (List[Path]): A list of file paths to check.
+
+        Returns:
+            List[Dict[str, Any]]: The detected smells, in the same order as calling
+                                  check_stale_logic, check_high_churn and
+                                  check_stale_tests one after another.
+        """
+        if not self.has_git_repo():
+            return []
 
+        stale_logic_settings = self._stale_logic_settings()
+        high_churn_settings = self._high_churn_settings()
+        test_index = self._build_test_index(file_paths)
+        stale_logic, high_churn, stale_tests = [], [], []
+
+        for file_path in self._source_files(file_paths):
+            timestamps = self._get_commit_timestamps(file_path)
+            for smells, smell in (
+                (stale_logic, self._check_stale_logic_one(file_path, timestamps, stale_logic_settings)),
+                (high_churn, self._check_high_churn_one(file_path, timestamps, high_churn_settings)),
+                (stale_tests, self._check_stale_tests_one(file_path, timestamps, test_index)),
+            ):
+                if smell:
+                    smells.append(smell)
+
+        return stale_logic + high_churn + stale_tests
+
+    def _source_files(self, file_paths: List[Path]):
+        """Yields the paths the file classifier marks as source files."""
         for file_path in file_paths:
-            classifications = self.file_classifier.classify_file(str(file_path))
-            if "source" in classifications:
-                # Attempt to find a corresponding test file
-                test_file_candidates = self._find_corresponding_test_candidates(file_path, all_files_str_set)
-
-                for test_file in test_file_candidates:
-                    try:
-                        source_commit_time = next(self.repo.iter_commits(paths=str(file_path), max_count=1)).committed_datetime
-                        test_commit_time = next(self.repo.iter_commits(paths=str(test_file), max_count=1)).committed_datetime
-
-                        if source_commit_time > test_commit_time:
-                            smells.append(create_smell(
-                                smell_type='STALE_TESTS',
-                                file_path=str(file_path),
-                                message=f"Source file ({file_path.name}) modified more recently than its test file ({Path(test_file).name}).",
-                                severity='Medium',
-                                category='Git Analysis'
-                            ))
-                            break # Found a stale test, no need to check other candidates
-                    except (StopIteration, git.exc.GitCommandError):
-                        continue # One of the files is not tracked or no commits
-        
-        return smells
+            if "source" in self.file_classifier.classify_file(str(file_path)):
+                yield file_path
+
+    def _stale_logic_settings(self):
+        """Returns (threshold_days, cutoff timestamp) for the stale-logic check."""
+        threshold_days = self.config.get('stale_logic_threshold_days', DEFAULT_CONFIG['stale_logic_threshold_days'])
+        cutoff_ts = (datetime.now(timezone.utc) - timedelta(days=threshold_days)).timestamp()
+        return threshold_days, cutoff_ts
 
-    def _find_corresponding_test_candidates(self, source_file: Path, all_files_str_set: set[str]) -> List[str]:
+    def _high_churn_settings(self):
+        """Returns (days, threshold_commits, window start timestamp) for the high-churn check."""
+        days = self.config.get('high_churn_days', DEFAULT_CONFIG['high_churn_days'])
+        threshold_commits = self.config.get('high_churn_threshold', DEFAULT_CONFIG['high_churn_threshold'])
+        since_ts = (datetime.now() - timedelta(days=days)).timestamp()
+        return days, threshold_commits, since_ts
+
+    def _check_stale_logic_one(self, file_path, timestamps: List[int], settings) -> Optional[Dict[str, Any]]:
+        """Returns a 'STALE_LOGIC' smell for one source file, or None."""
+        threshold_days, cutoff_ts = settings
+        # Timestamps are newest first, so [0] is the last commit; an empty list
+        # means the file is untracked or no commits exist for it
+        if timestamps and timestamps[0] < cutoff_ts:
+            return create_smell(
+                smell_type='STALE_LOGIC',
+                file_path=str(file_path),
+                message=f"Source file has not been modified in {threshold_days} days.",
+                severity='Low',
+                category='Git Analysis'
+            )
+        return None
+
+    def _check_high_churn_one(self, file_path, timestamps: List[int], settings) -> Optional[Dict[str, Any]]:
+        """Returns a 'HIGH_CHURN' smell for one source file, or None."""
+        days, threshold_commits, since_ts = settings
+        commit_count = sum(1 for ts in timestamps if ts >= since_ts)
+        if commit_count >= threshold_commits:
+            return create_smell(
+                smell_type='HIGH_CHURN',
+                file_path=str(file_path),
+                message=f"High churn: {commit_count} commits in the last {days} days.",
+                severity='Medium',
+                category='Git Analysis'
+            )
+        return None
+
+    def _check_stale_tests_one(self, file_path, timestamps: List[int], test_index: Dict[str, List[Path]]) -> Optional[Dict[str, Any]]:
+        """Returns a 'STALE_TESTS' smell for one source file, or None."""
+        if not timestamps:
+            return None # Source file is not tracked or has no commits
+
+        # Attempt to find a corresponding test file
+        for test_file in self._find_corresponding_test_candidates(Path(file_path), test_index):
+            test_timestamps = self._get_commit_timestamps(test_file)
+            if not test_timestamps:
+                continue # Test file is not tracked or has no commits
+
+            if timestamps[0] > test_timestamps[0]:
+                # Found a stale test, no need to check other candidates
+                return create_smell(
+                    smell_type='STALE_TESTS',
+                    file_path=str(file_path),
+                    message=f"Source file ({os.path.basename(str(file_path))}) modified more recently than its test file ({os.path.basename(test_file)}).",
+                    severity='Medium',
+                    category='Git Analysis'
+                )
+        return None
+
+    def _build_test_index(self, file_paths: List[Path]) -> Dict[str, List[Path]]:
+        """
+        Indexes test files by the source stem they could belong to, so candidate
+        lookup is a dict probe rather than a scan of every naming convention.
+
+        Args:
+            file_paths (List[Path]): All project files.
+
+        Returns:
+            Dict[str, List[Path]]: Source stem -> test files named after it.
+        """
+        test_index: Dict[str, List[Path]] = {}
+        for file_path in file_paths:
+            file_path = Path(file_path)
+            if file_path.suffix not in TEST_FILE_EXTS:
+                continue
+            if "test" not in self.file_classifier.classify_file(str(file_path)):
+                continue
+
+            # e.g. test_my_module.py, my_module_test.py and test_my_module_test.py -> my_module
+            stem = file_path.stem
+            source_stems = {stem}
+            if stem.startswith("test_"):
+                source_stems.add(stem[5:])
+            if stem.endswith("_test"):
+                source_stems.add(stem[:-5])
+                if stem.startswith("test_"):
+                    source_stems.add(stem[5:-5])
+
+            for source_stem in source_stems:
+                test_index.setdefault(source_stem, []).append(file_path)
+
+        return test_index
+
+    def _find_corresponding_test_candidates(self, source_file: Path, test_index: Dict[str, List[Path]]) -> List[str]:
         """
         Finds potential corresponding test file paths for a given source file.
         This is a heuristic and can be expanded based on project conventions.
 
         Args:
             source_file (Path): The path to the source file.
-            all_files_str_set (set[str]): A set of all project files as strings for quick lookup.
+            test_index (Dict[str, List[Path]]): Index built by _build_test_index().
 
         Returns:
             List[str]: A list of potential test file paths.
         """
-        candidates = []
-        source_name = source_file.stem # file name without extension
-        source_dir = source_file.parent
-
-        # Common test file naming conventions
-        # e.g., my_module.py -> test_my_module.py, my_module.py -> my_module_test.py
-        test_prefixes = ["test_", ""]
-        test_suffixes = ["_test", ""]
-        test_exts = [".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go"] # Common test extensions
-
-        # Check in the same directory
-        for prefix in test_prefixes:
-            for suffix in test_suffixes:
-                for ext in test_exts:
-                    candidate_name = f"{prefix}{source_name}{suffix}{ext}"
-                    candidate_path = source_dir / candidate_name
-                    if str(candidate_path) in all_files_str_set and "test" in self.file_classifier.classify_file(str(candidate_path)):
-                        candidates.append(str(candidate_path))
-
-        # Check in a 'tests' or '__tests__' subdirectory
-        # This assumes a structure like `src/module.py` and `tests/test_module.py`
-        for test_dir_name in ["test", "tests", "__tests__"]:
-            parts = list(source_file.parts)
-            try:
-                # Find the 'source' part of the path (e.g., 'src', 'app')
-                # This is a heuristic, and might need refinement based on actual project structure
-                source_root_index = -1
-                for i, part in enumerate(parts):
-                    if part in self.config.get("source_dirs", ["src", "app", "main"]):
-                        source_root_index = i
-                        break
-
-                if source_root_index != -1:
-                    # Construct path to parallel test directory
-                    # e.g., /project/src/module/file.py -> /project/tests/module/test_file.py
-                    relative_to_source_root = Path(*parts[source_root_index+1:])
-                    test_base_dir = Path(*parts[:source_root_index]) / test_dir_name
-                    
-                    for prefix in test_prefixes:
-                        for suffix in test_suffixes:
-                            for ext in test_exts:
-                                candidate_name = f"{prefix}{relative_to_source_root.stem}{suffix}{ext}"
-                                candidate_path = test_base_dir / relative_to_source_root.parent / candidate_name
-                                if str(candidate_path) in all_files_str_set and "test" in self.file_classifier.classify_file(str(candidate_path)):
-                                    candidates.append(str(candidate_path))
-            except Exception:
-                # Handle cases where path manipulation fails
-                pass
-
-        return list(set(candidates)) # Remove duplicates
+        tests_for_stem = test_index.get(source_file.stem)
+        if not tests_for_stem:
+            return []
+
+        # Tests are expected next to the source file...
+        candidate_dirs = {source_file.parent}
+
+        # ...or in a parallel 'tests' or '__tests__' directory
+        # e.g., /project/src/module/file.py -> /project/tests/module/test_file.py
+        parts = source_file.parts
+        source_dirs = self.config.get("source_dirs", ["src", "app", "main"])
+        source_root_index = next((i for i, part in enumerate(parts) if part in source_dirs), -1)
+        if source_root_index != -1:
+            relative_parent = Path(*parts[source_root_index + 1:]).parent
+            for test_dir_name in ["test", "tests", "__tests__"]:
+                candidate_dirs.add(Path(*parts[:source_root_index]) / test_dir_name / relative_parent)
+
+        return list({str(test_file) for test_file in tests_for_stem if test_file.parent in candidate_dirs})
@@ -6,7 +6,6 @@ import os
 from collections import defaultdict
 
 from .config import BOLD, RESET, GREY, RED, GREEN, YELLOW, ARCHITECTURAL_SMELLS
-from .ai_analysis import configure_gemini, call_llm
 
 # =============================================================================
 # INTERACTIVE DEEP DIVE MODE
@@ -17,6 +16,9 @@ def interactive_deep_dive(smells, directory, config=None):
     if not smells:
         return
     
+    # The AI stack is only loaded once a deep dive is actually requested
+    from .ai_analysis import configure_gemini
+    
     # Configure AI if not already done
     if not configure_gemini():
         print(f"{RED}AI not configured. Cannot perform deep dive analysis.{RESET}")
@@ -71,6 +73,8 @@ def interactive_deep_dive(smells, directory, config=None):
 
 def analyze_smell_with_ai(smell, directory, config=None):
     """Analyze a specific architectural smell with AI."""
+    from .ai_analysis import call_llm
+    
     smell_type = smell['type']
     
     # Get the relevant file(s) for analysis
@@ -104,10 +108,20 @@ def analyze_smell_with_ai(smell, directory, config=None):
             ]
             
             print(f"{GREY}Analyzing with AI...{RESET}")
-            response = call_llm(messages)
-            
             print(f"{GREEN}AI Analysis:{RESET}")
-            print(response)
+            # Show the answer as it streams in rather than after the whole response
+            streamed = []
+            def show_chunk(text):
+                streamed.append(text)
+                print(text, end="", flush=True)
+            response = call_llm(messages, on_chunk=show_chunk)
+            
+            streamed_text = "".join(streamed)
+            if streamed_text:
+                print()
+            if response != streamed_text:
+                # Nothing was streamed, or the stream broke off with an error
+                print(response)
             
         except Exception as e:
             print(f"{RED}Error analyzing {file_path}: {e}{RESET}")
@@ -6,9 +6,6 @@ import argparse
 import os
 from .config import PROJECT_ROOT, load_config, GREY, RESET
 from .utils import collect_all_project_files, clear_cache
-from .ai_analysis import run_llm_summarization, run_llm_code_review, configure_gemini
-from .coverage_analysis import run_coverage_analysis
-from .report_generators import generate_html_report, get_file_structure_from_data
 from .interactive import run_architectural_analysis
 
 # =============================================================================
@@ -61,8 +58,9 @@ Examples:
     
     # Load configuration
     config = load_config()
-      # Configure AI if needed
+      # Configure AI if needed; the AI modules are only imported for these flags
     if args.summarize or args.review:
+        from .ai_analysis import run_llm_summarization, run_llm_code_review, configure_gemini
         configure_gemini()
     
     # Determine directory to analyze
@@ -71,11 +69,7 @@ Examples:
     # Convert to absolute path for consistency
     directory = os.path.abspath(directory)
     
-    # Centralized file collection - walk filesystem once
-    print(f"{GREY}Collecting project files...{RESET}")
-    file_data = collect_all_project_files(directory, config=config)
-    
-    # Handle AI-only modes
+    # Handle AI-only modes; they find their own top files, so skip the full collection
     if args.summarize:
         run_llm_summarization(directory, config)
         return
@@ -84,6 +78,10 @@ Examples:
         run_llm_code_review(directory, config)
         return
     
+    # Centralized file collection - walk filesystem once
+    print(f"{GREY}Collecting project files...{RESET}")
+    file_data = collect_all_project_files(directory, config=config)
+    
     # If no flags are given, run architectural analysis by default (the "alerter" mode)
     if not any([args.tree, args.architecture, args.full, args.coverage, args.markdown, args.json, args.html_report]):
         run_architectural_analysis(directory, config, file_data)
@@ -96,11 +94,13 @@ Examples:
     # Handle coverage analysis
     coverage_report = None
     if args.coverage or args.full:
+        from .coverage_analysis import run_coverage_analysis
         coverage_report = run_coverage_analysis(directory)
     
     # Generate main structure analysis (only if --tree flag or --full)
     text_output = ""
     if args.tree or args.full:
+        from .report_generators import get_file_structure_from_data
         text_output = get_file_structure_from_data(
             directory, file_data, 
             markdown=args.markdown, 
@@ -111,6 +111,7 @@ Examples:
     
     # Generate HTML report if requested
     if args.html_report:
+        from .report_generators import generate_html_report
         generate_html_report(directory, text_output, config, coverage_report)
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ metrics to identify structural characteristics of the project.
 """
 
 import os
+from collections import deque
 from typing import Dict, Any, List, Optional
 
 class PatternAnalyzer:
@@ -95,8 +96,11 @@ class PatternAnalyzer:
 
     def _detect_cyclic_dependencies(self, graph: Dict[str, List[str]]) -> List[List[str]]:
         """
-        Detects cyclic dependencies in a directed graph using DFS.
-        Uses proper cycle detection that finds strongly connected components.
+        Detects cyclic dependencies in a directed graph.
+
+        Finds the strongly connected components with Tarjan's algorithm and reports
+        one representative cycle per component, so a tightly coupled cluster yields a
+        single finding and the whole search stays O(V + E).
 
         Args:
             graph (Dict[str, List[str]]): The dependency graph.
@@ -104,53 +108,100 @@ class PatternAnalyzer:
         Returns:
             List[List[str]]: A list of detected cycles, where each cycle is a list of nodes.
         """
-        visited = set()
-        recursion_stack = set()
         cycles = []
-        
-        def dfs(node, path):
-            if node in recursion_stack:
-                # Found a back edge - extract the cycle
-                cycle_start_idx = path.index(node)
-                cycle = path[cycle_start_idx:] + [node]
-                cycles.append(cycle)
-                return
-            
-            if node in visited:
-                return
-                
-            visited.add(node)
-            recursion_stack.add(node)
-            path.append(node)
-            
-            for neighbor in graph.get(node, []):
-                dfs(neighbor, path[:])  # Pass a copy of the path
-            
-            recursion_stack.remove(node)
-            path.pop()
-        
-        # Only start DFS from unvisited nodes to avoid duplicates
-        for node in graph:
-            if node not in visited:
-                dfs(node, [])
-        
-        # Remove duplicate cycles by normalizing them
-        unique_cycles = []
-        seen_cycles = set()
-        
-        for cycle in cycles:
-            if len(cycle) <= 1:
+        for component in self._strongly_connected_components(graph):
+            if len(component) == 1:
+                node = next(iter(component))
+                if node in graph.get(node, ()):
+                    cycles.append([node])  # A file that imports itself
                 continue
-                
-            # Normalize cycle by finding the lexicographically smallest rotation
-            min_rotation = min(cycle[i:] + cycle[:i] for i in range(len(cycle) - 1))
-            cycle_key = tuple(min_rotation[:-1])  # Remove duplicate last element
-            
-            if cycle_key not in seen_cycles:
-                unique_cycles.append(cycle[:-1])  # Remove duplicate last element
-                seen_cycles.add(cycle_key)
-        
-        return unique_cycles
+            cycles.append(self._shortest_cycle_through(min(component), component, graph))
+        return cycles
+
+    def _strongly_connected_components(self, graph: Dict[str, List[str]]) -> List[set]:
+        """
+        Tarjan's strongly connected components algorithm, written iteratively so deep
+        import chains cannot exhaust the interpreter's recursion limit.
+
+        Args:
+            graph (Dict[str, List[str]]): The dependency graph.
+
+        Returns:
+            List[set]: The strongly connected components of the graph.
+        """
+        index_of = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        next_index = 0
+
+        for root in graph:
+            if root in index_of:
+                continue
+            index_of[root] = lowlink[root] = next_index
+            next_index += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph.get(root, ())))]
+
+            while work:
+                node, neighbors = work[-1]
+                for neighbor in neighbors:
+                    if neighbor not in index_of:
+                        index_of[neighbor] = lowlink[neighbor] = next_index
+                        next_index += 1
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(graph.get(neighbor, ()))))
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[neighbor])
+                else:
+                    # All neighbours done: close the component rooted here, if any
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index_of[node]:
+                        component = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.add(member)
+                            if member == node:
+                                break
+                        components.append(component)
+
+        return components
+
+    def _shortest_cycle_through(self, start: str, component: set, graph: Dict[str, List[str]]) -> List[str]:
+        """
+        Breadth-first search for the shortest cycle that starts and ends at `start`,
+        staying inside its strongly connected component.
+
+        Args:
+            start (str): The node the cycle must pass through.
+            component (set): The strongly connected component containing `start`.
+            graph (Dict[str, List[str]]): The dependency graph.
+
+        Returns:
+            List[str]: The cycle's nodes, beginning with `start` (not repeated at the end).
+        """
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for neighbor in graph.get(node, ()):
+                if neighbor == start:
+                    cycle = [node]
+                    while parent[cycle[-1]] is not None:
+                        cycle.append(parent[cycle[-1]])
+                    return cycle[::-1]
+                if neighbor in component and neighbor not in parent:
+                    parent[neighbor] = node
+                    queue.append(neighbor)
+        return [start]  # Unreachable for a genuine multi-node component
 
     def _is_monolithic(self, code_metrics: Dict[str, Any], file_classifications: Dict[str, List[str]]) -> bool:
         """
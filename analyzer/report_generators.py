@@ -3,7 +3,6 @@ Report generation utilities for different output formats.
 """
 
 import os
-import re
 import json
 from datetime import datetime
 
@@ -14,6 +13,47 @@ from .utils import remove_ansi_colors
 # REPORT GENERATION
 # =============================================================================
 
+HTML_REPORT_TEMPLATE = '''
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Project Analyzer Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; background: #f8f8f8; color: #222; }
+        .container { max-width: 900px; margin: 2em auto; background: #fff; padding: 2em; border-radius: 8px; box-shadow: 0 2px 8px #0001; }
+        h1 { color: #2d5be3; }
+        pre { background: #f4f4f4; padding: 1em; border-radius: 6px; overflow-x: auto; }
+        .section { margin-bottom: 2em; }
+        .coverage { background: #e8f5e9; padding: 1em; border-radius: 6px; }
+        .timestamp { color: #888; font-size: 0.9em; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Project Analyzer Report</h1>
+        <div class="timestamp">Generated: {{ timestamp }}</div>
+        <div class="section">
+            <h2>File Tree & Stats</h2>
+            <pre>{{ file_tree }}</pre>
+        </div>
+        {% if coverage %}
+        <div class="section coverage">
+            <h2>Test Coverage</h2>
+            <pre>{{ coverage }}</pre>
+        </div>
+        {% endif %}
+        {% if config %}
+        <div class="section">
+            <h2>Analyzer Config</h2>
+            <pre>{{ config }}</pre>
+        </div>
+        {% endif %}
+    </div>
+</body>
+</html>
+'''
+
 def generate_html_report(directory, text_output, config, coverage_report):
     """Generate an HTML report of the analysis."""
     try:
@@ -22,49 +62,7 @@ def generate_html_report(directory, text_output, config, coverage_report):
         print(f"Jinja2 is required for HTML report generation. Install with 'pip install jinja2'.")
         return
     
-    html_template = '''
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <title>Project Analyzer Report</title>
-        <style>
-            body { font-family: Arial, sans-serif; background: #f8f8f8; color: #222; }
-            .container { max-width: 900px; margin: 2em auto; background: #fff; padding: 2em; border-radius: 8px; box-shadow: 0 2px 8px #0001; }
-            h1 { color: #2d5be3; }
-            pre { background: #f4f4f4; padding: 1em; border-radius: 6px; overflow-x: auto; }
-            .section { margin-bottom: 2em; }
-            .coverage { background: #e8f5e9; padding: 1em; border-radius: 6px; }
-            .timestamp { color: #888; font-size: 0.9em; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>Project Analyzer Report</h1>
-            <div class="timestamp">Generated: {{ timestamp }}</div>
-            <div class="section">
-                <h2>File Tree & Stats</h2>
-                <pre>{{ file_tree }}</pre>
-            </div>
-            {% if coverage %}
-            <div class="section coverage">
-                <h2>Test Coverage</h2>
-                <pre>{{ coverage }}</pre>
-            </div>
-            {% endif %}
-            {% if config %}
-            <div class="section">
-                <h2>Analyzer Config</h2>
-                <pre>{{ config }}</pre>
-            </div>
-            {% endif %}
-        </div>
-    </body>
-    </html>
-    '''
-    
-    template = Template(html_template)
-    html = template.render(
+    html = Template(HTML_REPORT_TEMPLATE).render(
         timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         file_tree=remove_ansi_colors(text_output),
         coverage=remove_ansi_colors(coverage_report) if coverage_report else None,
@@ -117,7 +115,7 @@ def get_file_structure_from_data(directory, file_data, markdown=False, json_outp
     if markdown:
         # Convert to markdown format
         result = result.replace(BOLD, "**").replace(RESET, "**")
-        result = re.sub(r"\033\[[0-9;]*m", "", result)  # Remove other ANSI codes
+        result = remove_ansi_colors(result)  # Remove other ANSI codes
     
     return result
 
@@ -154,6 +152,6 @@ def format_architectural_summary(smells, markdown=False):
     
     if markdown:
         result = result.replace(BOLD, "**").replace(RESET, "**")
-        result = re.sub(r"\033\[[0-9;]*m", "", result)
+        result = remove_ansi_colors(result)
     
     return result
@@ -6,18 +6,47 @@ import os
 import re
 import time
 import json
+import atexit
+import struct
 import hashlib
 import fnmatch
+import functools
 import threading
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+# Optional dependencies
+try:
+    import pathspec
+    HAS_PATHSPEC = True
+except ImportError:
+    HAS_PATHSPEC = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from .config import (
     CACHE_FILE, _cache_lock, EXCLUDED_DIRS, 
     get_configured_excluded_dirs, get_configured_exclude_patterns,
-    SCRIPT_EXTS
+    SCRIPT_EXTS, SCRIPT_EXTS_TUPLE
 )
 
+# Extensions that mark a file as binary without opening it
+_BINARY_EXTS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.pdf',
+    '.zip', '.tar', '.gz', '.bz2', '.xz', '.7z', '.jar', '.whl',
+    '.exe', '.dll', '.so', '.dylib', '.o', '.a', '.lib', '.class', '.pyc', '.pyo',
+    '.wasm', '.bin', '.dat', '.db', '.sqlite', '.pkl', '.h5', '.safetensors', '.parquet',
+    '.mp3', '.mp4', '.wav', '.ogg', '.mov', '.avi',
+    '.ttf', '.otf', '.woff', '.woff2'
+})
+
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
@@ -29,28 +58,74 @@ def get_file_size(file_path):
     except OSError:
         return 0
 
-def count_lines(file_path):
-    """Count lines in a text file, handling errors gracefully."""
-    try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            return sum(1 for _ in f)
-    except (OSError, IOError):
-        return 0
+_ANSI_COLOR_RE = re.compile(r"\033\[[0-9;]*m")
 
 def remove_ansi_colors(text):
     """Remove ANSI color codes from text."""
     if not text:
         return ""
-    return re.sub(r"\033\[[0-9;]*m", "", text)
+    return _ANSI_COLOR_RE.sub("", text)
+
+def has_binary_extension(file_path):
+    """Check whether a file's extension alone marks it as binary, without opening it."""
+    return os.path.splitext(file_path)[1].lower() in _BINARY_EXTS
+
+@dataclass
+class FileInfo:
+    """Per-file facts gathered in a single pass over the file."""
+    path: str
+    size: int
+    is_binary: bool
+    line_count: int
+    content_hash: Optional[str]
+
+# analyze_file() reads past the binary sniff in pieces of this size
+ANALYZE_FILE_CHUNK_SIZE = 1024 * 1024
+
+def analyze_file(entry, with_hash: bool = True) -> FileInfo:
+    """
+    Collects size, binary flag, line count and content hash with one stat and one open.
+
+    Args:
+        entry: A path or an os.DirEntry (whose cached stat result is reused).
+        with_hash (bool): Whether to compute the MD5 content hash.
+
+    Returns:
+        FileInfo: The gathered facts. Unreadable files are reported as binary with no hash.
+    """
+    if isinstance(entry, os.DirEntry):
+        path = entry.path
+        stat = entry.stat
+    else:
+        path = os.fspath(entry)
+        stat = lambda: os.stat(path)
 
-def is_binary_file(file_path):
-    """Check if a file is binary."""
     try:
-        with open(file_path, 'rb') as f:
-            chunk = f.read(1024)
-            return b'\x00' in chunk
+        size = stat().st_size
+        with open(path, 'rb') as f:
+            head = f.read(1024)
+            is_binary = b'\x00' in head
+            hash_md5 = hashlib.md5(head) if with_hash else None
+            line_count = 0 if is_binary else head.count(b'\n')
+            last_byte = head[-1:]
+            # A binary file gets no line count, so its rest is only read for the hash.
+            # Reading in chunks keeps memory flat however large the file is.
+            if with_hash or not is_binary:
+                for chunk in iter(lambda: f.read(ANALYZE_FILE_CHUNK_SIZE), b''):
+                    if not is_binary:
+                        line_count += chunk.count(b'\n')
+                    if hash_md5 is not None:
+                        hash_md5.update(chunk)
+                    last_byte = chunk[-1:]
     except (OSError, IOError):
-        return True
+        return FileInfo(path, 0, True, 0, None)
+
+    # A final line without a trailing newline still counts as a line
+    if not is_binary and last_byte not in (b'\n', b''):
+        line_count += 1
+
+    content_hash = hash_md5.hexdigest() if hash_md5 is not None else None
+    return FileInfo(path, size, is_binary, line_count, content_hash)
 
 def read_file_content(file_path: str) -> str:
     """
@@ -68,98 +143,390 @@ def read_file_content(file_path: str) -> str:
     except (FileNotFoundError, IOError, UnicodeDecodeError):
         return ""
 
+def load_json_file(file_path):
+    """
+    Parse a JSON file, using orjson when it is installed.
+
+    The file is read as bytes and handed to the parser directly, skipping the
+    separate text-decode step. Raises json.JSONDecodeError (which orjson's error
+    subclasses) on malformed input and OSError if the file cannot be read.
+    """
+    with open(file_path, "rb") as f:
+        data = f.read()
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_json_file(file_path, data):
+    """
+    Write data to a JSON file, using orjson when it is installed.
+
+    Values orjson cannot serialize fall back to the json module, so the
+    output is the same either way apart from whitespace and escaping.
+    """
+    encoded = None
+    if HAS_ORJSON:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    if encoded is None:
+        encoded = json.dumps(data, indent=2).encode("utf-8")
+    with open(file_path, "wb") as f:
+        f.write(encoded)
+
 # =============================================================================
 # FILE FILTERING AND GITIGNORE HANDLING
 # =============================================================================
 
 def parse_gitignore(directory, config=None):
-    """Parse .gitignore file and return ignore patterns."""
+    """
+    Parse .gitignore file and return ignore patterns.
+
+    Patterns are returned as a de-duplicated list in file order, since the
+    order matters for negated (``!pattern``) entries.
+
+    Only the top-level ``.gitignore`` of ``directory`` is read, once, before
+    any walk. Nested ``.gitignore`` files are deliberately not discovered, so
+    the cost of a walk does not grow with the depth of the tree.
+    """
     gitignore_path = Path(directory) / ".gitignore"
-    ignore_patterns = set()
+    ignore_patterns = []
     
     if gitignore_path.exists():
         try:
             with open(gitignore_path, "r", encoding="utf-8") as f:
                 for line in f:
                     line = line.strip()
-                    if line and not line.startswith("#"):
-                        ignore_patterns.add(line)
+                    if line and not line.startswith("#") and line not in ignore_patterns:
+                        ignore_patterns.append(line)
         except (OSError, IOError):
             pass
     
     if config:
-        ignore_patterns.update(get_configured_exclude_patterns(config))
+        for pattern in sorted(get_configured_exclude_patterns(config)):
+            if pattern not in ignore_patterns:
+                ignore_patterns.append(pattern)
     
     return ignore_patterns
 
-def should_ignore(path_str: str, gitignore_patterns: set, base_dir: str, config=None) -> bool:
-    """Check if a file or directory should be ignored."""
+# Named groups in pathspec's per-pattern regexes; they must go before the regexes are joined
+_REGEX_GROUP_NAME_RE = re.compile(r'\(\?P<\w+>')
+
+@functools.lru_cache(maxsize=32)
+def _compile_ignore_spec(patterns: tuple):
+    """
+    Compile gitignore patterns into a single matching function, once per distinct
+    pattern list.
+
+    Without negations a path is ignored if any pattern matches, so the pattern
+    regexes are joined into one alternation and tested with a single C-level
+    match. Negated patterns make the result depend on pattern order, so those
+    lists keep pathspec's own matcher, as do regexes that cannot be joined.
+    """
+    spec = pathspec.GitIgnoreSpec.from_lines(patterns)
+    active = _active_include_patterns(spec)
+    if active is None:
+        return spec.match_file
+    try:
+        return _join_pattern_regexes(active) or (lambda rel_posix: False)
+    except _UNJOINABLE_REGEX_ERRORS:
+        return spec.match_file
+
+def _active_include_patterns(spec):
+    """The spec's non-blank patterns, or None if any is negated or has no regex."""
+    active = [pattern for pattern in spec.patterns if pattern.include is not None]
+    if not all(pattern.include and getattr(pattern, "regex", None) is not None for pattern in active):
+        return None
+    return active
+
+# The joined regex is built from pathspec's compiled per-pattern regexes, which are
+# not part of its public API. Should a release change them so they no longer join
+# (a non-str regex, a back-reference to a renamed group), callers fall back to
+# pathspec's own matcher on these errors.
+_UNJOINABLE_REGEX_ERRORS = (re.error, AttributeError, TypeError)
+
+def _join_pattern_regexes(patterns):
+    """
+    One match function for a union of pathspec patterns, or None if there are none.
+    Raises one of _UNJOINABLE_REGEX_ERRORS if the regexes cannot be joined.
+    """
+    if not patterns:
+        return None
+    union = re.compile("|".join(
+        f"(?:{_REGEX_GROUP_NAME_RE.sub('(?:', pattern.regex.pattern)})" for pattern in patterns))
+    return lambda rel_posix: union.match(rel_posix) is not None
+
+@functools.lru_cache(maxsize=32)
+def _compile_file_ignore_spec(patterns: tuple):
+    """
+    Split gitignore patterns for files whose parent directory is already known
+    not to be ignored. Returns ``(name_match, path_match)``, either None when no
+    pattern needs it, or None overall when negations or unjoinable regexes require
+    pathspec's matcher.
+
+    Such a file cannot be matched through one of its directories, so
+    directory-only patterns (trailing ``/``) never apply and patterns without
+    an inner ``/`` only need the file's name; only the rest see the full path.
+    """
+    active = _active_include_patterns(pathspec.GitIgnoreSpec.from_lines(patterns))
+    if active is None:
+        return None
+    name_patterns, path_patterns = [], []
+    for pattern in active:
+        text = pattern.pattern
+        if text.endswith("/"):
+            continue
+        (path_patterns if "/" in text else name_patterns).append(pattern)
+    try:
+        return _join_pattern_regexes(name_patterns), _join_pattern_regexes(path_patterns)
+    except _UNJOINABLE_REGEX_ERRORS:
+        return None
+
+# Gitignore lines that name a file or directory literally, with no glob, anchor or escape
+_LITERAL_IGNORE_NAME_RE = re.compile(r'[^*?\[\]\\/!#]+')
+
+@functools.lru_cache(maxsize=32)
+def _literal_ignore_names(patterns: tuple):
+    """
+    Names that gitignore patterns ignore wherever they appear in a path, such as
+    ``dist`` or ``.env``. Empty if any pattern is negated, since the outcome then
+    depends on pattern order.
+    """
+    if any(pattern.startswith("!") for pattern in patterns):
+        return frozenset()
+    return frozenset(pattern for pattern in patterns if _LITERAL_IGNORE_NAME_RE.fullmatch(pattern))
+
+@functools.lru_cache(maxsize=32)
+def _compile_fnmatch_union(patterns: tuple):
+    """Join fnmatch-style patterns into one regex, once per distinct pattern list."""
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns))
+
+_PATH_SEPS = (os.sep, os.altsep) if os.altsep else (os.sep,)
+
+def _relative_parts(path_str, base_dir):
+    """
+    Split ``path_str`` into its components relative to ``base_dir``, or return
+    None if it lies outside it. Paths produced by walking ``base_dir`` are split
+    with plain string operations; anything else goes through Path.relative_to().
+    """
+    path_str = str(path_str)
+    base_str = str(base_dir)
+    if path_str.startswith(base_str):
+        rest = path_str[len(base_str):]
+        if not rest or rest[0] in _PATH_SEPS or base_str.endswith(_PATH_SEPS):
+            if os.altsep:
+                rest = rest.replace(os.altsep, os.sep)
+            return tuple(part for part in rest.split(os.sep) if part and part != '.')
     try:
-        relative_path = Path(path_str).relative_to(base_dir)
+        return Path(path_str).relative_to(base_dir).parts
     except ValueError:
-        return True
-    
+        return None
+
+def make_ignore_matcher(gitignore_patterns, base_dir: str, config=None):
+    """
+    Build a ``matcher(path_str, is_dir=False, name=None)`` with the same result as
+    should_ignore(). The excluded directories and the compiled gitignore spec are
+    resolved once, so walkers that test every path under base_dir only pay for
+    the match itself.
+
+    Walkers that prune ignored directories may pass a file's ``name`` to declare
+    that its parent directory was already let through by this matcher; only the
+    rules that can match the file itself are then tested.
+    """
     excluded_dirs = get_configured_excluded_dirs(config) if config else EXCLUDED_DIRS
-    if any(part in excluded_dirs for part in relative_path.parts):
-        return True
+    return _build_ignore_matcher(tuple(gitignore_patterns or ()), base_dir, excluded_dirs)
+
+@functools.lru_cache(maxsize=32)
+def _shared_ignore_matcher(gitignore_patterns: tuple, base_dir, excluded_dirs: frozenset):
+    """The matcher for should_ignore(), built once per distinct set of arguments."""
+    return _build_ignore_matcher(gitignore_patterns, base_dir, excluded_dirs)
+
+def _build_ignore_matcher(gitignore_patterns: tuple, base_dir, excluded_dirs):
+    """Build the matcher described in make_ignore_matcher() from resolved arguments."""
+    spec_match = fnmatch_union = None
+    literal_names = frozenset()
+    file_spec = (None, None)
+    if gitignore_patterns:
+        if HAS_PATHSPEC:
+            spec_match = _compile_ignore_spec(gitignore_patterns)
+            literal_names = _literal_ignore_names(gitignore_patterns)
+            file_spec = _compile_file_ignore_spec(gitignore_patterns)
+        else:
+            fnmatch_union = _compile_fnmatch_union(gitignore_patterns)
+            file_spec = None
     
-    for pattern in gitignore_patterns:
-        if fnmatch.fnmatch(str(relative_path), pattern) or fnmatch.fnmatch(relative_path.name, pattern):
+    def matcher(path_str, is_dir: bool = False, name=None) -> bool:
+        if name is not None and file_spec is not None:
+            # The parent passed every check, so only this file's own name and any
+            # pattern spanning directories are left to test
+            if name in excluded_dirs or name in literal_names:
+                return True
+            name_match, path_match = file_spec
+            if name_match is not None and name_match(name):
+                return True
+            if path_match is None:
+                return False
+            parts = _relative_parts(path_str, base_dir)
+            return parts is None or path_match("/".join(parts))
+        
+        parts = _relative_parts(path_str, base_dir)
+        if parts is None:
+            return True
+        
+        # One C-level set intersection test instead of a generator over the parts
+        if not excluded_dirs.isdisjoint(parts):
+            return True
+        
+        if not gitignore_patterns:
+            return False
+
+        # Plain-name patterns (dist, .env, ...) match any path component: a set probe, no regex
+        if not literal_names.isdisjoint(parts):
             return True
+
+        if spec_match is not None:
+            # Full gitignore semantics: '**', anchored '/' patterns, negation and directory-only patterns
+            rel_posix = "/".join(parts)
+            if is_dir:
+                rel_posix += "/"
+            return spec_match(rel_posix)
+
+        relative_str = os.path.normcase(os.sep.join(parts) if parts else ".")
+        name = os.path.normcase(parts[-1] if parts else "")
+        return fnmatch_union.match(relative_str) is not None or fnmatch_union.match(name) is not None
     
-    return False
+    return matcher
+
+def should_ignore(path_str: str, gitignore_patterns, base_dir: str, config=None, is_dir: bool = False) -> bool:
+    """
+    Check if a file or directory should be ignored.
+
+    Pass ``is_dir=True`` for directories so that directory-only patterns
+    (those with a trailing ``/``) can match them. The matcher for each distinct
+    pattern list, base directory and exclusion set is built once and reused;
+    make_ignore_matcher() hands it out directly for loops over many paths.
+    """
+    excluded_dirs = get_configured_excluded_dirs(config) if config else frozenset(EXCLUDED_DIRS)
+    matcher = _shared_ignore_matcher(tuple(gitignore_patterns or ()), base_dir, excluded_dirs)
+    return matcher(path_str, is_dir)
 
 # =============================================================================
 # CACHING SYSTEM
 # =============================================================================
 
+# The cache is read from disk once per process and shared by every caller.
+# Saves only mark it dirty; it is written back at exit, or after
+# CACHE_FLUSH_INTERVAL saves so a crash loses little work.
+CACHE_FLUSH_INTERVAL = 50
+_cache = None
+_cache_dirty = False
+_saves_since_flush = 0
+
 def load_cache():
-    """Load analysis cache from disk."""
-    if not os.path.exists(CACHE_FILE):
-        return {}
-    try:
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+    """Load analysis cache, reading it from disk only on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = {}
+            if os.path.exists(CACHE_FILE):
+                try:
+                    _cache = load_json_file(CACHE_FILE)
+                except Exception:
+                    pass
+        return _cache
 
 def save_cache(cache):
-    """Save analysis cache to disk."""
+    """Save analysis cache; the disk write is deferred and batched."""
+    global _cache, _cache_dirty, _saves_since_flush
+    with _cache_lock:
+        _cache = cache
+        _cache_dirty = True
+        _saves_since_flush += 1
+        if _saves_since_flush >= CACHE_FLUSH_INTERVAL:
+            flush_cache()
+
+def flush_cache():
+    """Write the in-memory cache to disk if it has unsaved changes."""
+    global _cache_dirty, _saves_since_flush
     with _cache_lock:
+        if not _cache_dirty:
+            return
         try:
             os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-            with open(CACHE_FILE, "w", encoding="utf-8") as f:
-                json.dump(cache, f, indent=2)
+            # Write to a temporary file first so an interrupted dump never truncates the cache
+            tmp_path = CACHE_FILE + ".tmp"
+            dump_json_file(tmp_path, _cache)
+            os.replace(tmp_path, CACHE_FILE)
         except Exception:
             pass
+        _cache_dirty = False
+        _saves_since_flush = 0
+
+atexit.register(flush_cache)
+
+def read_file_with_md5(file_path):
+    """
+    Read a text file and compute its MD5 hash from the same single read.
+
+    The content is decoded as UTF-8 with undecodable bytes dropped and newlines
+    normalised, exactly as a text-mode open() would return it. Raises OSError if
+    the file cannot be read.
+    """
+    with open(file_path, "rb") as f:
+        data = f.read()
+    content = data.decode("utf-8", errors="ignore")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content, hashlib.md5(data).hexdigest()
+
+# Below this many files a thread pool costs more than the stat calls it overlaps
+PARALLEL_STAT_MIN_FILES = 256
 
-def get_file_md5(file_path):
-    """Get MD5 hash of a file for cache invalidation."""
-    hash_md5 = hashlib.md5()
+# Per-file hash record: exists flag, mtime, size
+_FILE_RECORD = struct.Struct('<?dq')
+_MISSING_FILE_RECORD = _FILE_RECORD.pack(False, 0.0, 0)
+
+def _stat_one(file_path):
+    """Return (file_path, mtime, size), with None for files that cannot be stat'ed."""
     try:
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
-    except Exception:
-        return None
+        stat = os.stat(file_path)
+        return file_path, stat.st_mtime, stat.st_size
+    except (OSError, IOError):
+        return file_path, None, None
 
 def get_project_hash(file_paths):
     """Generate a hash representing the current state of all project files."""
-    file_hashes = []
-    for file_path in sorted(file_paths):
-        try:
-            stat = os.stat(file_path)
-            file_hashes.append(f"{file_path}:{stat.st_mtime}:{stat.st_size}")
-        except (OSError, IOError):
-            file_hashes.append(f"{file_path}:missing")
-    
-    combined = '|'.join(file_hashes)
-    return hashlib.md5(combined.encode()).hexdigest()
+    sorted_paths = sorted(file_paths)
+    if len(sorted_paths) >= PARALLEL_STAT_MIN_FILES:
+        # stat() is dominated by filesystem latency and releases the GIL,
+        # so many calls can be kept in flight at once
+        with ThreadPoolExecutor(max_workers=min(64, len(sorted_paths))) as executor:
+            stats = list(executor.map(_stat_one, sorted_paths))
+    else:
+        stats = [_stat_one(file_path) for file_path in sorted_paths]
+
+    # Stream fixed-size binary records into the hash rather than building and
+    # joining one formatted string per file
+    project_hash = hashlib.blake2b(digest_size=16)
+    for file_path, mtime, size in stats:
+        encoded_path = file_path.encode('utf-8', 'surrogateescape')
+        project_hash.update(struct.pack('<I', len(encoded_path)))
+        project_hash.update(encoded_path)
+        if mtime is None:
+            project_hash.update(_MISSING_FILE_RECORD)
+        else:
+            project_hash.update(_FILE_RECORD.pack(True, mtime, size))
+    return project_hash.hexdigest()
 
 
 def clear_cache():
     """Clear the analysis cache."""
+    global _cache, _cache_dirty, _saves_since_flush
+    with _cache_lock:
+        _cache = {}
+        _cache_dirty = False
+        _saves_since_flush = 0
     try:
         if os.path.exists(CACHE_FILE):
             os.remove(CACHE_FILE)
@@ -173,48 +540,109 @@ def clear_cache():
 # FILE COLLECTION UTILITIES
 # =============================================================================
 
+def scandir_walk(top):
+    """
+    Walk a directory tree top-down like os.walk(), but yield the os.DirEntry
+    objects of each directory so callers can reuse what scandir already knows
+    about every entry instead of stat-ing the paths again.
+
+    Yields (root, dir_entries, file_entries). Prune the walk by modifying
+    dir_entries in place. As with os.walk(), symlinked directories are listed
+    with the directories but not descended into.
+    """
+    stack = [top]
+    while stack:
+        root = stack.pop()
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        
+        dirs, files = [], []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirs if is_dir else files).append(entry)
+        
+        yield root, dirs, files
+        # Reversed so subdirectories are popped, and so visited, in listing order
+        stack.extend(entry.path for entry in reversed(dirs) if not entry.is_symlink())
+
+def _collect_directory(dirs, files, ignored, source_dirs, collected):
+    """
+    Record one directory's entries from scandir_walk() in ``collected``, pruning
+    ignored subdirectories from ``dirs`` in place.
+    """
+    # Remove ignored directories in-place
+    dirs[:] = [d for d in dirs if not ignored(d.path, is_dir=True)]
+    
+    # Track directories
+    for d in dirs:
+        collected['all_directories'].append(d.path)
+        if d.name in source_dirs:
+            collected['source_directories'].append(d.path)
+    
+    # Track files
+    for file in files:
+        file_path = file.path
+        if not ignored(file_path, name=file.name):
+            collected['all_files'].append(file_path)
+            
+            # Track script files
+            if file.name.lower().endswith(SCRIPT_EXTS_TUPLE):
+                collected['script_files'].append(file_path)
+
+def _collect_subtree(top, ignored, source_dirs):
+    """Walk everything below ``top`` (whose own entry the caller has recorded)."""
+    collected = {'all_files': [], 'all_directories': [], 'source_directories': [], 'script_files': []}
+    for _, dirs, files in scandir_walk(top):
+        _collect_directory(dirs, files, ignored, source_dirs, collected)
+    return collected
+
 def collect_all_project_files(directory, ignore_patterns=None, config=None):
     """
     Centralized file collection - walk the filesystem once and return comprehensive data.
     This replaces multiple os.walk() calls throughout the application.
+    
+    The top level is listed first and each top-level subdirectory is then walked
+    on its own thread, so the walks overlap their waits on the filesystem. Results
+    are merged in the order a single top-down walk would produce.
     """
     if ignore_patterns is None:
         ignore_patterns = parse_gitignore(directory, config)
     
-    all_files = []
-    all_directories = []
-    source_directories = set()
-    script_files = []
-    
     from .config import get_configured_source_dirs
     source_dirs = get_configured_source_dirs(config) if config else {"src", "app", "main"}
     
-    for root, dirs, files in os.walk(directory):
-        # Remove ignored directories in-place
-        dirs[:] = [d for d in dirs if not should_ignore(
-            os.path.join(root, d), ignore_patterns, directory, config)]
-        
-        # Track directories
-        for d in dirs:
-            dir_path = os.path.join(root, d)
-            all_directories.append(dir_path)
-            if d in source_dirs:
-                source_directories.add(dir_path)
-        
-        # Track files
-        for file in files:
-            file_path = os.path.join(root, file)
-            if not should_ignore(file_path, ignore_patterns, directory, config):
-                all_files.append(file_path)
-                
-                # Track script files
-                if Path(file).suffix.lower() in SCRIPT_EXTS:
-                    script_files.append(file_path)
+    ignored = make_ignore_matcher(ignore_patterns, directory, config)
+    collected = {'all_files': [], 'all_directories': [], 'source_directories': [], 'script_files': []}
+    subtrees = []
+    # DirEntry objects carry the joined path and the file type, so no entry is stat-ed
+    top_level = next(scandir_walk(directory), None)
+    if top_level is not None:
+        _, dirs, files = top_level
+        _collect_directory(dirs, files, ignored, source_dirs, collected)
+        # Symlinked directories are listed but, as in os.walk(), not descended into
+        subtrees = [d.path for d in dirs if not d.is_symlink()]
+    
+    if len(subtrees) > 1:
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            subtree_results = list(executor.map(
+                lambda top: _collect_subtree(top, ignored, source_dirs), subtrees))
+    else:
+        subtree_results = [_collect_subtree(top, ignored, source_dirs) for top in subtrees]
+    
+    for subtree in subtree_results:
+        for key, values in subtree.items():
+            collected[key].extend(values)
     
     return {
-        'all_files': all_files,
-        'all_directories': all_directories,
-        'source_directories': list(source_directories),
-        'script_files': script_files,
+        'all_files': collected['all_files'],
+        'all_directories': collected['all_directories'],
+        'source_directories': collected['source_directories'],
+        'script_files': collected['script_files'],
         'ignore_patterns': ignore_patterns
     }
@@ -7,7 +7,7 @@ that need to operate relative to a consistent project base directory.
 """
 
 import os
-from typing import Optional, List
+from typing import Optional, List, Iterable
 from pathlib import Path
 from .config import DEFAULT_CONFIG
 
@@ -30,6 +30,30 @@ class WorkspaceResolver:
         """
         self.project_root: Optional[str] = None
         self.markers = markers if markers is not None else DEFAULT_CONFIG["workspace_markers"]
+        # Optional in-memory index of known project files; see set_file_index()
+        self._file_index: Optional[set] = None
+        self._resolve_cache = {}
+
+    def set_file_index(self, file_paths: Iterable) -> None:
+        """
+        Registers the set of files that make up the project.
+
+        While an index is set, `resolve_import` answers existence checks with set
+        lookups instead of filesystem stat calls, and memoizes each result per
+        (import name, importing directory). Candidates not in the index are
+        treated as missing.
+
+        Args:
+            file_paths (Iterable): Absolute paths of all project files.
+        """
+        self._file_index = {os.path.normpath(str(p)) for p in file_paths}
+        self._resolve_cache = {}
+
+    def _is_file(self, path: Path) -> bool:
+        """Checks whether a candidate path is a file, using the file index when available."""
+        if self._file_index is not None:
+            return os.path.normpath(str(path)) in self._file_index
+        return path.is_file()
 
     def find_project_root(self, start_path: str) -> Optional[str]:
         """
@@ -139,6 +163,18 @@ class WorkspaceResolver:
         if not self.project_root:
             return None
 
+        if self._file_index is None:
+            return self._resolve_import_uncached(import_name, from_file, source_dirs, script_exts)
+
+        # Resolution depends only on the import name and the importing directory
+        cache_key = (import_name, str(from_file.parent))
+        if cache_key not in self._resolve_cache:
+            self._resolve_cache[cache_key] = self._resolve_import_uncached(
+                import_name, from_file, source_dirs, script_exts)
+        return self._resolve_cache[cache_key]
+
+    def _resolve_import_uncached(self, import_name: str, from_file: Path, source_dirs: List[str], script_exts: List[str]) -> Optional[Path]:
+        """Performs the actual import resolution for `resolve_import`."""
         # 1. Handle relative imports
         if import_name.startswith('.'):
             # Resolve relative path using from_file's parent
@@ -169,9 +205,9 @@ class WorkspaceResolver:
 
                 # Check for file with common script extensions or __init__.py
                 for ext in script_exts:
-                    if relative_resolved.with_suffix(ext).is_file():
+                    if self._is_file(relative_resolved.with_suffix(ext)):
                         return relative_resolved.with_suffix(ext)
-                if (relative_resolved / "__init__.py").is_file():
+                if self._is_file(relative_resolved / "__init__.py"):
                     return (relative_resolved / "__init__.py")
 
             except Exception:
@@ -185,29 +221,29 @@ class WorkspaceResolver:
         # Check in the same directory first
         potential_path = current_dir / module_path
         for ext in script_exts:
-            if potential_path.with_suffix(ext).is_file():
+            if self._is_file(potential_path.with_suffix(ext)):
                 return potential_path.with_suffix(ext)
         # Check for package imports
-        if (potential_path / "__init__.py").is_file():
+        if self._is_file(potential_path / "__init__.py"):
             return (potential_path / "__init__.py")
 
         # 3. Try absolute imports from configured source roots
         for source_dir in source_dirs:
             potential_path = (Path(self.project_root) / source_dir / module_path)
             for ext in script_exts:
-                if potential_path.with_suffix(ext).is_file():
+                if self._is_file(potential_path.with_suffix(ext)):
                     return potential_path.with_suffix(ext)
             # Check for package imports (e.g., `import my_package` where my_package is a directory)
-            if (potential_path / "__init__.py").is_file():
+            if self._is_file(potential_path / "__init__.py"):
                 return (potential_path / "__init__.py")
 
         # 4. Try imports from project root
         potential_path = Path(self.project_root) / module_path
         for ext in script_exts:
-            if potential_path.with_suffix(ext).is_file():
+            if self._is_file(potential_path.with_suffix(ext)):
                 return potential_path.with_suffix(ext)
         # Check for package imports
-        if (potential_path / "__init__.py").is_file():
+        if self._is_file(potential_path / "__init__.py"):
             return (potential_path / "__init__.py")
 
         return None
@@ -12,6 +12,7 @@ import tempfile
 import os
 import time
 import shutil
+import hashlib
 from pathlib import Path
 import sys
 
@@ -23,7 +24,7 @@ from analyzer.dependency_analysis import DependencyGraph, ImportParser
 from analyzer.pattern_analysis import PatternAnalyzer
 from analyzer.git_analysis import GitAnalyzer
 from analyzer.file_classifier import FileClassifier
-from analyzer.utils import load_cache, save_cache, get_project_hash
+from analyzer.utils import load_cache, save_cache, get_project_hash, load_json_file, dump_json_file, analyze_file
 
 
 class TestDependencyAnalysis(unittest.TestCase):
@@ -52,7 +53,23 @@ class TestDependencyAnalysis(unittest.TestCase):
         self.assertIn("file2.py", graph.imports["file1.py"])
         self.assertIn("file3.py", graph.imports["file1.py"])
         self.assertIn("file3.py", graph.imports["file2.py"])
-    
+
+    def test_dependency_graph_finalize(self):
+        """Test that finalizing a graph freezes adjacency lists without losing edges."""
+        graph = DependencyGraph()
+        graph.add_dependency("file1.py", "file2.py")
+        graph.add_dependency("file3.py", "file2.py")
+        graph.finalize()
+
+        self.assertIsInstance(graph.imports["file1.py"], tuple)
+        self.assertEqual(set(graph.imported_by["file2.py"]), {"file1.py", "file3.py"})
+        self.assertEqual(graph.get_import_count("file2.py"), 2)
+        self.assertEqual(graph.get_import_count("unknown.py"), 0)
+        self.assertEqual(graph.get_import_count(Path("file2.py")), 2)
+        self.assertEqual(graph.imports["unknown.py"], ())
+        self.assertEqual(graph.imported_by["file1.py"], ())
+        self.assertEqual(graph.find_circular_dependencies(), [])
+
     def test_import_parsing(self):
         """Test that imports are parsed correctly from source files."""
         # Create test Python file with imports
@@ -157,6 +174,24 @@ class TestArchitecturalPatternDetection(unittest.TestCase):
         self.assertFalse(patterns["cyclic_dependencies"]["detected"])
         self.assertEqual(patterns["cyclic_dependencies"]["count"], 0)
     
+    def test_cycles_reported_once_per_cluster(self):
+        """Test that a tightly coupled cluster and a deep chain are each reported once."""
+        dependency_graph = {
+            "a.py": ["b.py", "c.py"],
+            "b.py": ["a.py", "c.py"],
+            "c.py": ["a.py"],
+            "d.py": ["a.py"]
+        }
+        cycles = self.analyzer._detect_cyclic_dependencies(dependency_graph)
+        self.assertEqual(cycles, [["a.py", "b.py"]])
+
+        # Deeper than the default recursion limit
+        chain = {f"m{i}.py": [f"m{i + 1}.py"] for i in range(5000)}
+        chain["m5000.py"] = ["m0.py"]
+        cycles = self.analyzer._detect_cyclic_dependencies(chain)
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(len(cycles[0]), 5001)
+    
     def test_monolithic_structure_detection(self):
         """Test detection of monolithic structures."""
         # Create file classifications with high source ratio
@@ -255,6 +290,17 @@ class TestCachingSystem(unittest.TestCase):
         self.assertEqual(loaded_data["test_key"], "test_value")
         self.assertEqual(loaded_data["nested"]["key"], "value")
     
+    def test_json_file_round_trip(self):
+        """Test that cache data written with dump_json_file reads back unchanged."""
+        path = os.path.join(self.temp_dir, "round_trip.json")
+        data = {"key": "välue", "nested": {"list": [1, 2.5, None, True]}, "count": 3}
+        dump_json_file(path, data)
+        self.assertEqual(load_json_file(path), data)
+
+        # Non-string keys are written as strings, as the json module does
+        dump_json_file(path, {1: "one"})
+        self.assertEqual(load_json_file(path), {"1": "one"})
+    
     def test_project_hash_consistency(self):
         """Test that project hash generation is consistent."""
         test_files = [
@@ -274,6 +320,44 @@ class TestCachingSystem(unittest.TestCase):
         hash3 = get_project_hash(different_files)
         self.assertNotEqual(hash1, hash3)
     
+    def test_analyze_file_text_and_binary(self):
+        """Test that one analyze_file pass reports line counts, binary flags and hashes."""
+        text_file = Path(self.temp_dir) / "module.py"
+        text_file.write_text("x = 1\n" * 500 + "y = 2")
+        binary_file = Path(self.temp_dir) / "blob.dat"
+        binary_data = b"\x00" * 4096 + b"\n" * 10
+        binary_file.write_bytes(binary_data)
+
+        info = analyze_file(str(text_file))
+        self.assertEqual((info.is_binary, info.line_count), (False, 501))
+        self.assertEqual(info.content_hash, hashlib.md5(text_file.read_bytes()).hexdigest())
+
+        for with_hash in (True, False):
+            with self.subTest(with_hash=with_hash):
+                info = analyze_file(str(binary_file), with_hash=with_hash)
+                self.assertEqual((info.is_binary, info.line_count, info.size), (True, 0, len(binary_data)))
+                expected_hash = hashlib.md5(binary_data).hexdigest() if with_hash else None
+                self.assertEqual(info.content_hash, expected_hash)
+
+    def test_analyze_file_reads_in_chunks(self):
+        """Test that chunked reading gives the same counts and hashes across chunk boundaries."""
+        import hashlib
+        from unittest import mock
+        cases = {
+            "empty.py": (b"", 0),
+            "head_only.py": (b"a = 1\nb = 2", 2),
+            "boundary.py": (b"x" * 1023 + b"\n" + b"y = 2\n" * 10, 11),
+            "unterminated.py": (b"x = 1\n" * 400 + b"tail", 401),
+        }
+        with mock.patch("analyzer.utils.ANALYZE_FILE_CHUNK_SIZE", 7):
+            for name, (data, expected) in cases.items():
+                with self.subTest(name=name):
+                    test_file = Path(self.temp_dir) / name
+                    test_file.write_bytes(data)
+                    info = analyze_file(str(test_file))
+                    self.assertEqual((info.is_binary, info.line_count), (False, expected))
+                    self.assertEqual(info.content_hash, hashlib.md5(data).hexdigest())
+
     def test_architectural_analysis_caching(self):
         """Test that architectural analysis results are cached."""
         # Create test project
@@ -8,6 +8,7 @@ and other boundary conditions.
 """
 
 import unittest
+from unittest import mock
 import tempfile
 import os
 import shutil
@@ -23,6 +24,8 @@ from analyzer.workspace_resolver import WorkspaceResolver
 from analyzer.pattern_analysis import PatternAnalyzer
 from analyzer.git_analysis import GitAnalyzer
 from analyzer.dependency_analysis import ImportParser
+from analyzer import coverage_analysis
+from analyzer.coverage_analysis import is_jest_project, read_line_coverage_pct
 
 
 class TestEmptyDirectoriesAndFiles(unittest.TestCase):
@@ -136,6 +139,26 @@ def incomplete_function(
         self.assertNotIn("source", classifications, 
                         "Binary files should not be classified as source")
     
+    def test_malformed_package_json(self):
+        """Test that Jest detection tolerates a malformed package.json."""
+        (self.project_dir / "package.json").write_text('{"devDependencies": {"jest": ')
+        self.assertFalse(is_jest_project(str(self.project_dir)))
+
+        (self.project_dir / "package.json").write_text('{"devDependencies": {"jest": "^29.0.0"}}')
+        self.assertTrue(is_jest_project(str(self.project_dir)))
+
+    def test_coverage_summary_line_pct(self):
+        """Test that the overall line coverage is read with and without ijson."""
+        summary = self.project_dir / "coverage-summary.json"
+        summary.write_text('{"total": {"lines": {"total": 10, "pct": 87.5}, "statements": {"pct": 80}},'
+                           ' "/src/a.js": {"lines": {"pct": 12}}}')
+        missing = self.project_dir / "empty-summary.json"
+        missing.write_text('{"/src/a.js": {"lines": {"pct": 12}}}')
+        for has_ijson in sorted({False, coverage_analysis.HAS_IJSON}):
+            with self.subTest(has_ijson=has_ijson), mock.patch.object(coverage_analysis, "HAS_IJSON", has_ijson):
+                self.assertEqual(read_line_coverage_pct(str(summary)), 87.5)
+                self.assertEqual(read_line_coverage_pct(str(missing)), 0)
+    
     def test_files_with_unicode_content(self):
         """Test analysis of files with Unicode content."""
         unicode_file = self.project_dir / "unicode.py"
@@ -8,13 +8,21 @@ This test validates all the optimizations implemented:
 3. Pattern Matching in FileClassifier (fnmatch-based)
 4. Smell Factory centralization
 5. Configuration Defaults (DEFAULT_CONFIG)
+6. Ignore Pattern Matching (should_ignore / parse_gitignore)
 """
 
+import io
+import re
 import unittest
+import asyncio
 import tempfile
 import os
 import shutil
 import time
+import json
+from unittest import mock
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 from pathlib import Path
 import sys
 
@@ -23,11 +31,20 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'analyzer'))
 
 from analyzer.decorators import cache_result
 from analyzer.smell_factory import create_smell
-from analyzer.config import DEFAULT_CONFIG
+from analyzer import ai_analysis
+from analyzer import config as config_module
+from analyzer import utils
+from analyzer.ai_analysis import (
+    find_top_script_files, looks_clean_locally, parse_llm_json, _build_batch_messages, _split_batch_result
+)
+from analyzer.config import DEFAULT_CONFIG, CODE_REVIEW_SCHEMA, CODE_SUMMARY_SCHEMA
 from analyzer.file_classifier import FileClassifier
 from analyzer.workspace_resolver import WorkspaceResolver
-from analyzer.git_analysis import GitAnalyzer
-from analyzer.utils import load_cache, save_cache
+from analyzer.git_analysis import GitAnalyzer, HAS_GIT
+from analyzer.utils import (
+    load_cache, save_cache, should_ignore, make_ignore_matcher, scandir_walk, parse_gitignore,
+    collect_all_project_files, _literal_ignore_names, _compile_ignore_spec, HAS_PATHSPEC
+)
 
 
 class TestCachingDecorator(unittest.TestCase):
@@ -197,6 +214,20 @@ class TestConfigurationDefaults(unittest.TestCase):
         resolver = WorkspaceResolver()
         self.assertEqual(resolver.markers, DEFAULT_CONFIG["workspace_markers"])
 
+    def test_loaded_config_copies_are_independent(self):
+        """Test that changing a loaded config does not leak into later loads."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        config_file = os.path.join(temp_dir, ".analyzer-config.json")
+        with open(config_file, "w", encoding="utf-8") as f:
+            json.dump({"source_dirs": ["src"]}, f)
+
+        with mock.patch.object(config_module, "CONFIG_FILE", config_file), \
+             mock.patch.object(config_module, "_loaded_config", None):
+            first = config_module.load_config()
+            first["source_dirs"].append("lib")
+            self.assertEqual(config_module.load_config(), {"source_dirs": ["src"]})
+
 
 class TestPatternMatching(unittest.TestCase):
     """Test the unified fnmatch-based pattern matching in FileClassifier."""
@@ -275,6 +306,16 @@ class TestPatternMatching(unittest.TestCase):
             self.assertEqual(has_config, should_match,
                            f"File {file_path} config classification: expected {should_match}, got {has_config}")
 
+    def test_classification_cached_per_basename(self):
+        """Test that classifications are memoized by basename and returned as fresh lists."""
+        first = self.classifier.classify_file("pkg/a/test_main.py")
+        first.append("mutated")
+        second = self.classifier.classify_file("pkg/b/test_main.py")
+
+        self.assertNotIn("mutated", second)
+        self.assertIn("test", second)
+        self.assertIn("test_main.py", self.classifier._classification_cache)
+
 
 class TestImportResolution(unittest.TestCase):
     """Test consolidated import resolution in WorkspaceResolver."""
@@ -366,6 +407,23 @@ class TestImportResolution(unittest.TestCase):
         
         self.assertIsNone(resolved)
 
+    def test_resolve_with_file_index(self):
+        """Test that an indexed resolver answers from the index and memoizes results."""
+        from_file = self.project_dir / "src" / "main.py"
+        indexed_only = self.project_dir / "src" / "indexed.py"  # not on disk
+        self.resolver.set_file_index([
+            self.project_dir / "src" / "main.py",
+            self.project_dir / "src" / "utils.py",
+            indexed_only,
+        ])
+
+        self.assertEqual(self.resolver.resolve_import("indexed", from_file, ["src"], [".py"]), indexed_only)
+        self.assertEqual(self.resolver.resolve_import(".utils", from_file, ["src"], [".py"]),
+                         self.project_dir / "src" / "utils.py")
+        # On disk but absent from the index, so treated as missing
+        self.assertIsNone(self.resolver.resolve_import("subpackage.module", from_file, ["src"], [".py"]))
+        self.assertIn(("indexed", str(from_file.parent)), self.resolver._resolve_cache)
+
 
 class TestGitAnalyzerOptimizations(unittest.TestCase):
     """Test GitAnalyzer optimizations (caching and smell factory usage)."""
@@ -413,6 +471,537 @@ class TestGitAnalyzerOptimizations(unittest.TestCase):
             DEFAULT_CONFIG['high_churn_days']
         )
 
+    def test_test_index_finds_candidates(self):
+        """Test that test files are indexed by source stem and located by directory."""
+        src = self.project_dir / "src"
+        files = [
+            src / "pkg" / "module.py",
+            src / "pkg" / "test_module.py",
+            self.project_dir / "tests" / "pkg" / "module_test.py",
+            self.project_dir / "tests" / "other" / "test_module.py",
+        ]
+        test_index = self.git_analyzer._build_test_index(files)
+
+        self.assertNotIn(files[0], test_index.get("module", []))
+        candidates = self.git_analyzer._find_corresponding_test_candidates(files[0], test_index)
+        self.assertEqual(sorted(candidates), sorted([str(files[1]), str(files[2])]))
+        self.assertEqual(self.git_analyzer._find_corresponding_test_candidates(src / "pkg" / "other.py", test_index), [])
+
+    @unittest.skipUnless(HAS_GIT, "GitPython not installed")
+    def test_commit_index_without_commits(self):
+        """Test that a repository with no commits yields an empty commit index."""
+        import git
+        git.Repo.init(self.project_dir)
+        source_file = self.project_dir / "module.py"
+        source_file.write_text("x = 1\n")
+
+        git_analyzer = GitAnalyzer(self.project_dir, {}, FileClassifier({}))
+        self.assertEqual(git_analyzer._load_commit_index(), {})
+        self.assertEqual(git_analyzer._get_commit_timestamps(source_file), [])
+
+    @unittest.skipUnless(HAS_GIT, "GitPython not installed")
+    def test_run_all_checks_matches_individual_checks(self):
+        """Test that the fused git pass reports the same smells as the separate checks."""
+        import git
+        repo = git.Repo.init(self.project_dir)
+        (self.project_dir / "module.py").write_text("x = 1\n")
+        (self.project_dir / "test_module.py").write_text("assert True\n")
+        repo.index.add(["module.py", "test_module.py"])
+        actor = git.Actor("Test", "test@example.com")
+        repo.index.commit("initial", author=actor, committer=actor, commit_date="2001-01-01T00:00:00")
+        (self.project_dir / "module.py").write_text("x = 2\n")
+        repo.index.add(["module.py"])
+        repo.index.commit("update", author=actor, committer=actor)
+
+        config = {"high_churn_threshold": 1}
+        git_analyzer = GitAnalyzer(self.project_dir, config, FileClassifier(config))
+        files = [self.project_dir / "module.py", self.project_dir / "test_module.py"]
+
+        separate = (
+            git_analyzer.check_stale_logic.__wrapped__(git_analyzer, files)
+            + git_analyzer.check_high_churn.__wrapped__(git_analyzer, files)
+            + git_analyzer.check_stale_tests.__wrapped__(git_analyzer, files)
+        )
+        fused = git_analyzer.run_all_checks.__wrapped__(git_analyzer, files)
+        self.assertEqual(fused, separate)
+        self.assertEqual({smell["type"] for smell in fused}, {"STALE_LOGIC", "HIGH_CHURN", "STALE_TESTS"})
+
+
+class TestIgnoreMatching(unittest.TestCase):
+    """Test gitignore pattern handling in should_ignore."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = os.path.join(self.temp_dir, "project")
+        os.makedirs(self.base)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _ignored(self, rel_path, patterns, is_dir=False):
+        return should_ignore(os.path.join(self.base, rel_path), patterns, self.base, is_dir=is_dir)
+
+    def test_parse_gitignore_preserves_order(self):
+        """Test that patterns keep file order so negations apply correctly."""
+        with open(os.path.join(self.base, ".gitignore"), "w") as f:
+            f.write("# comment\n*.log\n!keep.log\n*.log\n")
+        self.assertEqual(parse_gitignore(self.base), ["*.log", "!keep.log"])
+
+    def test_excluded_dirs_and_simple_patterns(self):
+        """Test default excluded directories and basename patterns."""
+        self.assertTrue(self._ignored("node_modules/pkg/index.js", []))
+        self.assertTrue(self._ignored("src/__pycache__/mod.pyc", []))
+        self.assertTrue(self._ignored("src/debug.log", ["*.log"]))
+        self.assertFalse(self._ignored("src/main.py", ["*.log"]))
+
+    @unittest.skipUnless(HAS_PATHSPEC, "pathspec not installed")
+    def test_gitignore_semantics(self):
+        """Test negation, anchored, '**' and directory-only patterns."""
+        patterns = ["*.log", "!keep.log", "/top.txt", "docs/**/*.md", "out/"]
+        self.assertFalse(self._ignored("keep.log", patterns))
+        self.assertTrue(self._ignored("top.txt", patterns))
+        self.assertFalse(self._ignored("src/top.txt", patterns))
+        self.assertTrue(self._ignored("docs/a/b/c.md", patterns))
+        self.assertTrue(self._ignored("out", patterns, is_dir=True))
+        self.assertFalse(self._ignored("out", patterns))
+
+    def test_literal_names_extracted_without_negations(self):
+        """Test that only plain names take the set-lookup fast path, and none when negations exist."""
+        self.assertEqual(_literal_ignore_names(("dist", ".env", "*.log", "/top", "out/", "a/b", "x[12]")),
+                         frozenset({"dist", ".env"}))
+        self.assertEqual(_literal_ignore_names(("dist", "!dist/keep")), frozenset())
+
+    @unittest.skipUnless(HAS_PATHSPEC, "pathspec not installed")
+    def test_literal_names_match_at_any_depth(self):
+        """Test that plain-name patterns ignore matching files and whole directories at any depth."""
+        patterns = ["generated", ".env"]
+        self.assertTrue(self._ignored("src/generated/api.py", patterns))
+        self.assertTrue(self._ignored("generated", patterns, is_dir=True))
+        self.assertTrue(self._ignored("config/.env", patterns))
+        self.assertFalse(self._ignored("src/generated_api.py", patterns))
+
+    @unittest.skipUnless(HAS_PATHSPEC, "pathspec not installed")
+    def test_joined_patterns_match_pathspec(self):
+        """Test that the single joined regex agrees with pathspec pattern by pattern."""
+        import pathspec
+
+        patterns = ("*.log", "/top.txt", "docs/**/*.md", "out/", "build", "**/cache/**", "*.py[cod]")
+        spec = pathspec.GitIgnoreSpec.from_lines(patterns)
+        matcher = _compile_ignore_spec(patterns)
+        paths = ["a.log", "src/a.log", "top.txt", "src/top.txt", "docs/x/y.md", "docs.md",
+                 "out/", "out", "src/out/a.py", "build", "build/x", "a/cache/b", "cache",
+                 "m.pyc", "m.py", "src/main.py"]
+        for path in paths:
+            with self.subTest(path=path):
+                self.assertEqual(matcher(path), spec.match_file(path))
+
+    @unittest.skipUnless(HAS_PATHSPEC, "pathspec not installed")
+    def test_unjoinable_regexes_fall_back_to_pathspec(self):
+        """Test that pathspec's own matcher is used when its regexes cannot be joined."""
+        patterns = ("*.log", "/top.txt", "src/*.tmp", "out/")
+        expected = make_ignore_matcher(list(patterns), self.base)
+        self.addCleanup(utils._compile_ignore_spec.cache_clear)
+        self.addCleanup(utils._compile_file_ignore_spec.cache_clear)
+        utils._compile_ignore_spec.cache_clear()
+        utils._compile_file_ignore_spec.cache_clear()
+
+        with mock.patch.object(utils, "_join_pattern_regexes", side_effect=re.error("unjoinable")):
+            spec_match = utils._compile_ignore_spec(patterns)
+            self.assertIsNone(utils._compile_file_ignore_spec(patterns))
+            ignored = make_ignore_matcher(list(patterns), self.base)
+
+        self.assertEqual(spec_match.__name__, "match_file")
+        for rel_path in ("a.log", "src/a.log", "top.txt", "src/top.txt", "src/x.tmp", "out", "src/main.py"):
+            file_path = os.path.join(self.base, rel_path)
+            with self.subTest(path=rel_path):
+                self.assertEqual(ignored(file_path, name=os.path.basename(rel_path)), expected(file_path))
+                self.assertEqual(ignored(file_path, is_dir=True), expected(file_path, is_dir=True))
+
+    def test_matcher_agrees_with_should_ignore(self):
+        """Test that a prebuilt matcher gives the same answers as should_ignore."""
+        patterns = ["*.log", "!keep.log", "build/"]
+        ignored = make_ignore_matcher(patterns, self.base)
+        cases = [("keep.log", False), ("src/debug.log", False), ("src/main.py", False),
+                 ("node_modules/x.js", False), ("build", True), ("build", False)]
+        for rel_path, is_dir in cases:
+            with self.subTest(path=rel_path, is_dir=is_dir):
+                self.assertEqual(ignored(os.path.join(self.base, rel_path), is_dir=is_dir),
+                                 self._ignored(rel_path, patterns, is_dir=is_dir))
+        self.assertTrue(ignored(os.path.join(self.temp_dir, "outside.py")))
+
+    def test_file_name_checks_agree_with_full_match(self):
+        """Test that files in kept directories get the same answer from the name-only path."""
+        patterns = ["*.log", "/top.txt", "src/*.tmp", "out/", "cache", "docs/**/*.md"]
+        ignored = make_ignore_matcher(patterns, self.base)
+        rel_paths = ["a.log", "src/a.log", "top.txt", "src/top.txt", "src/x.tmp", "lib/src/x.tmp",
+                     "out", "src/cache", "docs/x/y.md", "src/main.py", "node_modules"]
+        for rel_path in rel_paths:
+            with self.subTest(path=rel_path):
+                file_path = os.path.join(self.base, rel_path)
+                self.assertEqual(ignored(file_path, name=os.path.basename(rel_path)),
+                                 ignored(file_path))
+
+    def test_scandir_walk_matches_os_walk(self):
+        """Test that scandir_walk visits the same tree as os.walk and honours pruning."""
+        for rel_dir in ("src/pkg", "src/skip", "docs"):
+            os.makedirs(os.path.join(self.base, rel_dir))
+        for rel_file in ("README.md", "src/main.py", "src/pkg/mod.py", "src/skip/gen.py"):
+            Path(self.base, rel_file).write_text("x\n")
+        try:
+            # Listed as a directory but, as with os.walk, not descended into
+            os.symlink(os.path.join(self.base, "docs"), os.path.join(self.base, "src", "docs_link"))
+        except (OSError, NotImplementedError):
+            pass
+
+        def listing(walk):
+            return {root: (sorted(dirs), sorted(files)) for root, dirs, files in walk}
+
+        expected = listing(os.walk(self.base))
+        actual = listing((root, [d.name for d in dirs], [f.name for f in files])
+                         for root, dirs, files in scandir_walk(self.base))
+        self.assertEqual(actual, expected)
+
+        visited = []
+        for root, dirs, _ in scandir_walk(self.base):
+            visited.append(root)
+            dirs[:] = [d for d in dirs if d.name != "skip"]
+        self.assertNotIn(os.path.join(self.base, "src", "skip"), visited)
+        self.assertIn(os.path.join(self.base, "src", "pkg"), visited)
+
+    def test_collect_all_project_files_matches_serial_walk(self):
+        """Test that the per-subtree parallel collection returns the same entries as a serial walk."""
+        for rel_dir in ("src/pkg", "app", "docs/guide", "node_modules/dep", "logs"):
+            os.makedirs(os.path.join(self.base, rel_dir))
+        for rel_file in ("setup.py", "src/main.py", "src/pkg/mod.py", "app/view.ts", "docs/guide/intro.md",
+                         "node_modules/dep/index.js", "logs/run.log", "src/debug.log"):
+            Path(self.base, rel_file).write_text("x\n")
+        patterns = ["*.log"]
+
+        expected_files, expected_dirs = [], []
+        for root, dirs, files in os.walk(self.base):
+            dirs[:] = [d for d in dirs if not self._ignored(os.path.relpath(os.path.join(root, d), self.base),
+                                                           patterns, is_dir=True)]
+            expected_dirs.extend(os.path.join(root, d) for d in dirs)
+            expected_files.extend(os.path.join(root, f) for f in files
+                                  if not self._ignored(os.path.relpath(os.path.join(root, f), self.base), patterns))
+
+        collected = collect_all_project_files(self.base, patterns)
+        self.assertEqual(sorted(collected['all_files']), sorted(expected_files))
+        self.assertEqual(sorted(collected['all_directories']), sorted(expected_dirs))
+        self.assertEqual(sorted(collected['source_directories']),
+                         [os.path.join(self.base, "app"), os.path.join(self.base, "src")])
+        self.assertEqual(sorted(collected['script_files']),
+                         sorted(p for p in expected_files if p.endswith((".py", ".ts"))))
+
+
+class TestLLMConcurrency(unittest.TestCase):
+    """Test that AI requests are sent concurrently within the configured limit."""
+
+    def test_requests_bounded_and_ordered(self):
+        """Test that results keep request order and in-flight calls respect the limit."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_acall_llm(messages, schema=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return messages
+
+        requests = [(f"request-{i}", None) for i in range(10)]
+        with mock.patch.object(ai_analysis, "acall_llm", fake_acall_llm):
+            results = asyncio.run(ai_analysis._call_llm_concurrently(requests, 3))
+
+        self.assertEqual(results, [f"request-{i}" for i in range(10)])
+        self.assertEqual(peak, 3)
+
+    def test_requests_run_inside_a_running_event_loop(self):
+        """Test that requests are still sent when the caller already runs an event loop."""
+        async def fake_acall_llm(messages, schema=None):
+            await asyncio.sleep(0)
+            return messages
+
+        async def caller():
+            return ai_analysis._run_llm_requests([("a", None), ("b", None)], 2)
+
+        with mock.patch.object(ai_analysis, "acall_llm", fake_acall_llm):
+            self.assertEqual(ai_analysis._run_llm_requests([("a", None)], 2), ["a"])
+            self.assertEqual(asyncio.run(caller()), ["a", "b"])
+
+
+class TestTopFileAnalysis(unittest.TestCase):
+    """Test how run_llm_analysis_on_top_files caches and reports per-file AI results."""
+
+    def setUp(self):
+        """Set up a project directory and stub out the Gemini client and the cache file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.top_files = []
+        self.cache = {}
+        for name, kwargs in (("configure_gemini", {"return_value": True}),
+                             ("find_top_script_files", {"side_effect": lambda *args, **kwargs: self.top_files}),
+                             ("load_cache", {"return_value": self.cache}),
+                             ("save_cache", {})):
+            patcher = mock.patch.object(ai_analysis, name, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _add_top_file(self, rel_path):
+        path = Path(self.temp_dir, rel_path)
+        path.parent.mkdir(parents=True)
+        path.write_text("def f():\n    return 1\n" * 40)
+        self.top_files.append((80, str(path)))
+        return path
+
+    def _run(self, config=None):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            ai_analysis.run_llm_analysis_on_top_files(self.temp_dir, "prompt", "Review", CODE_REVIEW_SCHEMA,
+                                                      config=config)
+        return output.getvalue()
+
+    def test_batch_response_missing_a_file(self):
+        """Test that a file a batched response skips is reported as an error, not as clean."""
+        self._add_top_file("src/a.py")
+        self._add_top_file("app/b.py")
+        response = json.dumps({"results": [{"file": "src/a.py", "positive_points": ["Tidy"],
+                                            "refactoring_suggestions": []}]})
+
+        async def fake_call_llm_concurrently(requests, max_concurrency):
+            return [response]
+
+        with mock.patch.object(ai_analysis, "_call_llm_concurrently", fake_call_llm_concurrently):
+            output = self._run(config={"llm_batch_size": 2})
+
+        first, second = output.split("File 2:")
+        self.assertIn("Tidy", first)
+        self.assertIn("not covered by the batched AI response", second)
+        self.assertNotIn("Code looks clean", second)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_file_results_cached_once_and_errors_not_cached(self):
+        """Test that a file's result is cached once under its file key, and never when it is an error."""
+        path = self._add_top_file("src/a.py")
+        responses = ['{"error": "quota exceeded"}',
+                     json.dumps({"positive_points": ["Tidy"], "refactoring_suggestions": []})]
+
+        class FakeModel:
+            async def generate_content_async(self, prompt, generation_config=None, stream=False):
+                text = responses.pop(0)
+
+                async def chunks():
+                    yield SimpleNamespace(text=text)
+                return chunks()
+
+        for expected in ("quota exceeded", "Tidy"):
+            with mock.patch.object(ai_analysis, "HAS_GENAI", True), \
+                    mock.patch.object(ai_analysis, "_get_gemini_model", return_value=FakeModel()):
+                output = self._run()
+            with self.subTest(expected=expected):
+                self.assertIn(expected, output)
+                self.assertNotIn("Code looks clean", output)
+
+        # The error was not cached, so the second run asked again and cached only the file result
+        self.assertEqual(responses, [])
+        self.assertEqual(list(self.cache), [f"{path}|{ai_analysis.read_file_with_md5(str(path))[1]}|Review"])
+
+
+class TestLLMBatching(unittest.TestCase):
+    """Test packing several files into one AI prompt and splitting the answer back up."""
+
+    def test_split_batch_result(self):
+        """Test that a batched response is split back into per-file results."""
+        response = json.dumps({"results": [
+            {"file": "src/b.py", "summary": "B"},
+            {"file": "src/a.py", "summary": "A"},
+        ]})
+        split = _split_batch_result(response, ["src/a.py", "src/b.py", "src/c.py"])
+        self.assertEqual([json.loads(r) if r else None for r in split],
+                         [{"summary": "A"}, {"summary": "B"}, None])
+        self.assertEqual(_split_batch_result("not json", ["src/a.py"]), [None])
+
+    def test_batch_prompt_fences_code_by_language(self):
+        """Test that batched files are fenced with their Markdown language tag."""
+        messages = _build_batch_messages("system", "context", [
+            ("src/a.py", "x = 1"), ("web/b.TS", "let y = 2;"), ("bin/run", "echo hi")])
+        user_prompt = messages[1]["content"]
+        self.assertIn("```python\nx = 1\n```", user_prompt)
+        self.assertIn("```typescript\nlet y = 2;\n```", user_prompt)
+        self.assertIn("```text\necho hi\n```", user_prompt)
+
+
+class TestLLMResponses(unittest.TestCase):
+    """Test parsing and caching of AI responses."""
+
+    def test_parse_llm_json(self):
+        """Test that plain and fenced JSON responses both parse."""
+        self.assertEqual(parse_llm_json(' {"summary": "A"}\n'), {"summary": "A"})
+        self.assertEqual(parse_llm_json('```json\n{"summary": "A"}\n```'), {"summary": "A"})
+        self.assertEqual(parse_llm_json('```\n{"summary": "A"}\n```'), {"summary": "A"})
+        with self.assertRaises(json.JSONDecodeError):
+            parse_llm_json("Sorry, I can't help with that.")
+
+    def test_llm_responses_cached_by_prompt(self):
+        """Test that successful responses are cached per exact prompt and errors are not."""
+        config = {"temperature": 0.2}
+        key = ai_analysis._llm_cache_key("prompt", config)
+        self.assertEqual(key, ai_analysis._llm_cache_key("prompt", dict(config)))
+        self.assertNotEqual(key, ai_analysis._llm_cache_key("other prompt", config))
+
+        cache = {}
+        with mock.patch.object(ai_analysis, "load_cache", return_value=cache), \
+                mock.patch.object(ai_analysis, "save_cache"):
+            ai_analysis._cache_llm_response("ok", '{"summary": "A"}')
+            ai_analysis._cache_llm_response("failed", '{"error": "quota exceeded"}')
+        self.assertEqual(cache, {"ok": '{"summary": "A"}'})
+
+
+class TestGeminiClient(unittest.TestCase):
+    """Test the Gemini model handle and streamed responses, with a fake genai module."""
+
+    def setUp(self):
+        """Install a fake genai module whose model is set per test."""
+        self.model = mock.Mock()
+        self.created = []
+        self.fake_genai = SimpleNamespace(GenerativeModel=lambda name: self.created.append(name) or self.model,
+                                          configure=lambda api_key: None)
+        for name, value in (("HAS_GENAI", True), ("genai", self.fake_genai), ("_gemini_model", None)):
+            patcher = mock.patch.object(ai_analysis, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_streamed_json_response_stops_when_complete(self):
+        """Test that a streamed JSON response is not read past the complete object."""
+        consumed = []
+
+        def chunks():
+            for text in ('{"summary": ', '"done"}', '\nTrailing chatter'):
+                consumed.append(text)
+                yield SimpleNamespace(text=text)
+
+        self.model.generate_content.return_value = chunks()
+        received = []
+        with mock.patch.object(ai_analysis, "load_cache", return_value={}), \
+                mock.patch.object(ai_analysis, "save_cache"):
+            result = ai_analysis.call_llm([{"role": "user", "content": "hi"}],
+                                          json_schema={"type": "object"}, on_chunk=received.append)
+
+        self.assertEqual(result, '{"summary": "done"}')
+        self.assertEqual(received, ['{"summary": ', '"done"}'])
+        self.assertEqual(len(consumed), 2)
+        self.assertTrue(self.model.generate_content.call_args.kwargs["stream"])
+
+    def test_gemini_model_created_once(self):
+        """Test that every request reuses one model until the client is reconfigured."""
+        self.fake_genai.GenerativeModel = lambda name: self.created.append(name) or object()
+        with mock.patch.dict(os.environ, {"GOOGLE_API_KEY": "test-key"}):
+            first = ai_analysis._get_gemini_model()
+            self.assertIs(ai_analysis._get_gemini_model(), first)
+            self.assertTrue(ai_analysis.configure_gemini())
+            self.assertIsNot(ai_analysis._get_gemini_model(), first)
+        self.assertEqual(len(self.created), 2)
+
+
+class TestSchemaValidation(unittest.TestCase):
+    """Test that AI responses are checked against their schema through cached validators."""
+
+    def _printed(self, response, validator):
+        output = io.StringIO()
+        with mock.patch.object(ai_analysis, "get_schema_validator", return_value=validator), \
+                redirect_stdout(output):
+            ai_analysis._print_llm_result(response, "Summary", CODE_SUMMARY_SCHEMA)
+        return output.getvalue()
+
+    def test_mismatched_response_prints_warning(self):
+        """Test that a response failing validation is flagged but still printed."""
+        validator = mock.Mock()
+        validator.is_valid.return_value = False
+        printed = self._printed('{"summary": "A"}', validator)
+        self.assertIn("does not match the expected schema", printed)
+        self.assertIn("A", printed)
+        validator.is_valid.assert_called_once_with({"summary": "A"})
+
+    def test_valid_response_or_no_validator_prints_no_warning(self):
+        """Test that valid responses, or runs without jsonschema, print no warning."""
+        validator = mock.Mock()
+        validator.is_valid.return_value = True
+        for current in (validator, None):
+            with self.subTest(validator=current):
+                self.assertNotIn("does not match", self._printed('{"summary": "A"}', current))
+
+    @unittest.skipUnless(ai_analysis._build_validator({}) is not None, "jsonschema not installed")
+    def test_validators_compiled_once(self):
+        """Test that each schema's validator is built on first use and then reused."""
+        validator = ai_analysis.get_schema_validator(CODE_REVIEW_SCHEMA)
+        self.assertIs(ai_analysis.get_schema_validator(CODE_REVIEW_SCHEMA), validator)
+        self.assertFalse(validator.is_valid({"positive_points": "not a list"}))
+        self.assertIsNone(ai_analysis.get_schema_validator({"type": "object"}))
+
+
+class TestTopScriptFiles(unittest.TestCase):
+    """Test selection of the largest script file per source directory."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, rel_path, line_count):
+        path = Path(self.temp_dir, rel_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n" * line_count)
+        return str(path)
+
+    def test_largest_file_per_source_dir(self):
+        """Test that each source directory contributes its largest substantial file."""
+        self._write("src/small.py", 60)
+        big = self._write("src/pkg/big.py", 200)
+        app_file = self._write("app/main.py", 80)
+        self._write("app/tiny.py", 10)
+        self._write("other/huge.py", 500)
+        Path(self.temp_dir, "src", "blob.py").write_bytes(b"\x00" * 4096)
+        # Known binary extensions are skipped by name, whatever their content
+        self._write("src/weights.pkl", 1000)
+
+        top = find_top_script_files(self.temp_dir, [], self.temp_dir)
+        self.assertEqual(top, [(200, big), (80, app_file)])
+
+        # Only the largest count files are returned
+        top = find_top_script_files(self.temp_dir, [], self.temp_dir, count=1)
+        self.assertEqual(top, [(200, big)])
+
+
+class TestLocalReview(unittest.TestCase):
+    """Test the local check that lets simple files skip the LLM review."""
+
+    def test_simple_python_file_passes(self):
+        """Test that short, plain functions pass the local review."""
+        code = "def add(a, b):\n    return a + b\n\n\nclass Point:\n    x = 0\n"
+        self.assertTrue(looks_clean_locally("src/math.py", code))
+
+    def test_files_needing_review_fail(self):
+        """Test that markers, long or branchy functions, duplicates and other languages are sent on."""
+        long_function = "def f():\n" + "    x = 1\n" * 45
+        branchy_function = "def f(x):\n" + "    if x:\n        pass\n" * 11
+        cases = {
+            "marker": ("src/a.py", "def f():\n    pass  # TODO: handle errors\n"),
+            "long": ("src/a.py", long_function),
+            "branchy": ("src/a.py", branchy_function),
+            "duplicate": ("src/a.py", "def f():\n    pass\n\ndef f():\n    pass\n"),
+            "syntax error": ("src/a.py", "def f(:\n"),
+            "not python": ("src/a.js", "function f() { return 1; }\n"),
+        }
+        for name, (file_path, code) in cases.items():
+            with self.subTest(case=name):
+                self.assertFalse(looks_clean_locally(file_path, code))
+
 
 class TestBackwardCompatibility(unittest.TestCase):
     """Test that optimizations maintain backward compatibility."""